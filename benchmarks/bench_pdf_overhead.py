@@ -0,0 +1,71 @@
+"""Measure the per-file overhead of the PDF stage in Worker.
+
+Runs the real Worker pipeline with StubBackend, so no Word is needed. Only
+the per-file PDF step is timed, ConverterSession.convert plus the pdf_ready
+check, so DOCX rendering running alongside is not counted; the overhead is
+whatever that step spends outside the backend's own convert call.
+
+    python benchmarks/bench_pdf_overhead.py path/to/template.docx [students]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+def run(template_path, count):
+    students = [
+        {"name": f"Student {i}", "student_number": str(100000 + i)}
+        for i in range(count)
+    ]
+    backend = main.StubBackend()
+    pdf_step = []  # seconds per call of the timed PDF step functions
+
+    def timed(func):
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                pdf_step.append(time.perf_counter() - started)
+
+        return wrapper
+
+    def callback(progress=0.0, message="", done=False, error=False):
+        if error:
+            raise SystemExit(message)
+
+    main.ConverterSession.convert = timed(main.ConverterSession.convert)
+    main.pdf_ready = timed(main.pdf_ready)
+    main.play_wav = lambda *args: None
+    main.Worker(
+        students,
+        template_path,
+        callback,
+        gen_docx=True,
+        gen_pdf=True,
+        converter=lambda: backend,
+    ).run()
+
+    stage = sum(pdf_step)
+    converting = sum(c[2] for c in backend.calls if c[0] == "convert")
+    overhead = (stage - converting) / count
+    print(f"students:          {count}")
+    print(f"PDF step:          {stage:.3f} s")
+    print(f"inside converter:  {converting:.3f} s")
+    print(f"overhead per file: {overhead * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    template = os.path.abspath(sys.argv[1])
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        run(template, count)
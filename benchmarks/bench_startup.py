@@ -0,0 +1,62 @@
+"""Measure cold-start import time of main.py.
+
+Imports main in fresh interpreters and reports the median wall time, then
+lists the slowest modules from one `python -X importtime` run.
+
+    python benchmarks/bench_startup.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROBE = (
+    "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+)
+
+
+def import_seconds():
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=REPO,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def slowest_modules(limit=10):
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=REPO,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            rows.append((int(cumulative), name.strip()))
+        except ValueError:
+            continue  # header line
+    return sorted(rows, reverse=True)[:limit]
+
+
+def run(runs):
+    times = [import_seconds() for _ in range(runs)]
+    print(f"runs:              {runs}")
+    print(f"import main:       {statistics.median(times) * 1000:.1f} ms (median)")
+    print(f"fastest / slowest: {min(times) * 1000:.1f} / {max(times) * 1000:.1f} ms")
+    print("slowest imports (cumulative):")
+    for micros, name in slowest_modules():
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
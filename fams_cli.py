@@ -0,0 +1,111 @@
+"""Headless batch mode for FAMS.
+
+Runs the same generation pipeline as the GUI (main.Worker) without loading
+Tk, pygame or pyttsx3. Progress is printed to stdout as one JSON object per
+line; the exit status is 0 on success and 1 on failure. Output goes to
+fams_output/ in the current directory.
+
+    python fams_cli.py roster.csv template.docx --docx --pdf --merge-pdf
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+
+import main
+
+
+def emit(event, **fields):
+    print(json.dumps({"event": event, **fields}), flush=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate student documents without the GUI."
+    )
+    parser.add_argument("roster", help="student file (.csv, .txt, .xls, .xlsx)")
+    parser.add_argument("template", help="DOCX template")
+    parser.add_argument("--docx", action="store_true", help="keep individual DOCX")
+    parser.add_argument("--pdf", action="store_true", help="generate PDFs")
+    parser.add_argument("--merge-docx", action="store_true", help="MERGED_ALL.docx")
+    parser.add_argument("--merge-pdf", action="store_true", help="MERGED_ALL.pdf")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=main.RENDER_WORKERS,
+        help=f"render processes (default {main.RENDER_WORKERS})",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="rebuild every student, even those whose outputs are up to date",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="stream a CSV roster in chunks instead of loading it whole",
+    )
+    args = parser.parse_args(argv)
+    if not (args.docx or args.pdf or args.merge_docx or args.merge_pdf):
+        parser.error("choose at least one of --docx, --pdf, --merge-docx, --merge-pdf")
+    if args.merge_pdf and not args.pdf:
+        parser.error("--merge-pdf requires --pdf")
+    return args
+
+
+def run(args):
+    log = lambda message: emit("log", message=message)
+    try:
+        if args.stream:
+            students = main.iter_students(args.roster, log)
+        else:
+            students = main.read_students(args.roster, log)
+    except Exception as e:
+        emit("error", message=f"Failed to read file: {e}")
+        return 1
+
+    result = {"status": 1}
+
+    def position(progress):
+        """Fraction done, or the rows processed when the length is unknown"""
+        if worker.total is None:
+            return {"rows": worker.processed}
+        return {"progress": round(progress, 4)}
+
+    def callback(progress=0.0, message="", done=False, error=False):
+        if error:
+            emit("error", **position(progress), message=message)
+        elif done:
+            result["status"] = 0
+            emit("done", progress=1.0, message=message)
+        else:
+            emit("progress", **position(progress), message=message)
+
+    worker = main.Worker(
+        students,
+        os.path.abspath(args.template),
+        callback,
+        gen_docx=args.docx,
+        gen_pdf=args.pdf,
+        merge_docx=args.merge_docx,
+        merge_pdf=args.merge_pdf,
+        workers=args.workers,
+        sounds=False,
+        incremental=not args.full,
+    )
+    if args.pdf and worker.converter is None:
+        emit(
+            "warning",
+            message="No DOCX to PDF converter on this platform (Microsoft Word is "
+            "Windows-only): PDFs will be simple placeholder certificates, "
+            "not renders of the template.",
+        )
+    worker.run()  # in this thread; the pipeline starts its own stages
+    return result["status"]
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(run(parse_args()))
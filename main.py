@@ -3,21 +3,60 @@ import warnings
 warnings.filterwarnings("ignore", category=UserWarning)
 import os, sys, subprocess, threading
 from datetime import datetime
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-import pandas as pd
-from docxtpl import DocxTemplate
-from docxcompose.composer import Composer
-from PIL import Image, ImageTk
-from docx import Document
-from PyPDF2 import PdfMerger
+import importlib
 import unicodedata
 import time
-from PyPDF2 import PdfReader
-import pygame
-import pyttsx3
-
-import customtkinter as ctk
+import io
+import re
+import copy
+import hashlib
+import zipfile
+import zlib
+import struct
+import multiprocessing
+import codecs
+import itertools
+import queue
+import json
+import collections
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access, so
+    startup and render workers only pay for the libraries they use"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+# Tk, audio and speech are only loaded by the GUI, so the engine can run
+# headless (see fams_cli.py)
+tk = LazyModule("tkinter")
+ttk = LazyModule("tkinter.ttk")
+filedialog = LazyModule("tkinter.filedialog")
+messagebox = LazyModule("tkinter.messagebox")
+pd = LazyModule("pandas")
+np = LazyModule("numpy")
+docxtpl = LazyModule("docxtpl")
+Image = LazyModule("PIL.Image")
+ImageTk = LazyModule("PIL.ImageTk")
+openpyxl = LazyModule("openpyxl")
+PyPDF2 = LazyModule("PyPDF2")
+generic = LazyModule("PyPDF2.generic")
+jinja2 = LazyModule("jinja2")
+markupsafe = LazyModule("markupsafe")
+etree = LazyModule("lxml.etree")
+pygame = LazyModule("pygame")
+pyttsx3 = LazyModule("pyttsx3")
+ctk = LazyModule("customtkinter")
 
 BASE_OUT = "fams_output"
 DOCX_OUT = os.path.join(BASE_OUT, "docx")
@@ -25,47 +64,153 @@ PDF_OUT = os.path.join(BASE_OUT, "pdf")
 MERGED_DOCX_OUT = os.path.join(BASE_OUT, "merged_docx")
 MERGED_PDF_OUT = os.path.join(BASE_OUT, "merged_pdf")
 LOG_FILE = os.path.join(BASE_OUT, "fams_log.txt")
-encodings = [
-    "utf-8",
-    "utf-8-sig",
-    "latin1",
-    "cp1252",
-    "ascii",
-    "utf-16",
-    "utf-16-le",
-    "utf-16-be",
-    "cp850",
-    "cp437",
-    "mac_roman",
-]
+MANIFEST_FILE = os.path.join(BASE_OUT, "manifest.json")
+SOUNDS_DIR = os.path.join("assets", "sounds")
+# Spoken announcements; set FAMS_SPEECH=0 for silent or unattended runs
+SPEECH_ENABLED = os.environ.get("FAMS_SPEECH", "1") != "0"
+REQUIRED_PLACEHOLDERS = {"name", "student_number"}
+RENDER_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+SIMPLE_PLACEHOLDER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+# Values with these characters are reshaped after rendering (listings, escaped
+# braces), so they always take the full Jinja path
+PLAIN_VALUE_BREAKERS = re.compile(r"[{}\t\n\a\f]")
+POOL_MIN_STUDENTS = 200  # below this, process startup costs more than it saves
+PIPELINE_DEPTH = 32  # records waiting between two pipeline stages
+STREAM_CHUNK_ROWS = 5000  # rows parsed at a time when streaming a CSV roster
+UI_FRAME_MS = 50  # how often queued worker/log events are applied to the UI
+LOG_VISIBLE_LINES = 500  # newest log lines kept in the Activity Log widget
+LOG_MAX_BYTES = 2 * 1024 * 1024  # fams_log.txt size before it is rotated
+LOG_BACKUPS = 3  # rotated log files kept
+LOG_FLUSH_SECONDS = 1.0  # longest a log record waits in memory
+LOG_BATCH_RECORDS = 500  # records buffered before an early write
+ROSTER_CACHE_DIR = os.path.join(BASE_OUT, "roster_cache")
+ROSTER_CACHE_ENTRIES = 20  # parsed rosters kept before the oldest is evicted
+ENCODING_SAMPLE_BYTES = 64 * 1024  # bytes read to pick a roster's encoding
+# Byte values that cp1252 leaves undefined; a file using them is not cp1252
+CP1252_UNDEFINED = frozenset(b"\x81\x8d\x8f\x90\x9d")
 green_hex = "#228B22"
 hover_green_hex = "#1F7E1F"
 
 
-def wait_for_pdf(path, timeout=15):
-    start = time.time()
-    while time.time() - start < timeout:
-        if os.path.exists(path) and os.path.getsize(path) > 1024:
-            return True
-        time.sleep(0.3)
-    return False
+def pdf_ready(path):
+    """One-shot check that a converter finished writing a PDF: the file exists,
+    is not empty and starts with the PDF header"""
+    try:
+        with open(path, "rb") as f:
+            return f.read(5) == b"%PDF-"
+    except OSError:
+        return False
 
 
-def play_wav(file_path):
-    pygame.mixer.init()
-    pygame.mixer.music.load(file_path)
-    pygame.mixer.music.play()
+class AudioCues(threading.Thread):
+    """Plays sound cues on one background thread. The mixer is initialised
+    once and every wav in sound_dir is preloaded; without an audio device
+    cues are silently dropped."""
 
-    while pygame.mixer.music.get_busy():
-        continue
+    def __init__(self, sound_dir=SOUNDS_DIR):
+        super().__init__(daemon=True)
+        self.sound_dir = sound_dir
+        self.sounds = {}
+        self.available = None  # unknown until the mixer has started
+        self._q = queue.SimpleQueue()
 
+    def play(self, path):
+        self._q.put(os.path.normcase(os.path.abspath(path)))
 
-def is_valid_pdf(path):
-    try:
-        reader = PdfReader(path)
-        return len(reader.pages) > 0
-    except Exception:
-        return False
+    def _load(self, path):
+        sound = self.sounds[path] = pygame.mixer.Sound(path)
+        return sound
+
+    def _start_mixer(self):
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"Audio cues disabled: {e}")
+            return False
+        self._channel = pygame.mixer.Channel(0)
+        if os.path.isdir(self.sound_dir):
+            for name in os.listdir(self.sound_dir):
+                if name.lower().endswith(".wav"):
+                    path = os.path.join(self.sound_dir, name)
+                    try:
+                        self._load(os.path.normcase(os.path.abspath(path)))
+                    except pygame.error as e:
+                        print(f"Failed to load sound {name}: {e}")
+        return True
+
+    def run(self):
+        self.available = self._start_mixer()
+        while True:
+            path = self._q.get()
+            if not self.available:
+                continue
+            try:
+                sound = self.sounds.get(path) or self._load(path)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Failed to play sound {os.path.basename(path)}: {e}")
+                continue
+            self._channel.play(sound)  # a new cue replaces the one playing
+
+
+_audio_cues = None
+_audio_lock = threading.Lock()
+
+
+class Speaker(threading.Thread):
+    """One long-lived text-to-speech engine fed by say(). Only the newest
+    announcement waiting to be spoken is kept; older ones are dropped. With
+    enabled=False, or when no engine can start, say() does nothing."""
+
+    def __init__(self, enabled=True):
+        super().__init__(daemon=True)
+        self.enabled = enabled
+        self._pending = None
+        self._cond = threading.Condition()
+
+    def say(self, text):
+        if not self.enabled:
+            return
+        with self._cond:
+            self._pending = text  # replaces a stale announcement
+            self._cond.notify()
+            if self.ident is None:  # start on the first announcement
+                self.start()
+
+    def _engine(self):
+        engine = pyttsx3.init()
+        for voice in engine.getProperty("voices"):
+            if "female" in voice.name.lower() or "zira" in voice.name.lower():
+                engine.setProperty("voice", voice.id)
+                break
+        return engine
+
+    def run(self):
+        try:
+            engine = self._engine()
+        except Exception as e:
+            print(f"Speech disabled: {e}")
+            self.enabled = False
+            return
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                text, self._pending = self._pending, None
+            try:
+                engine.say(text)
+                engine.runAndWait()
+            except Exception as e:
+                print(f"Speech failed: {e}")
+
+
+def play_wav(file_path):
+    """Queue a sound cue and return immediately"""
+    global _audio_cues
+    with _audio_lock:
+        if _audio_cues is None:
+            _audio_cues = AudioCues()
+            _audio_cues.start()
+    _audio_cues.play(file_path)
 
 
 def sanitize_filename(name):
@@ -73,80 +218,433 @@ def sanitize_filename(name):
     return "".join(c if c.isalnum() or c in " -_." else "_" for c in name)
 
 
-def read_students(path, log_func=None):
+def sniff_encoding(path, sample_size=ENCODING_SAMPLE_BYTES):
+    """Pick a text file's encoding from its first sample_size bytes.
+    Returns (encoding, confidence, reason)."""
+    with open(path, "rb") as f:
+        sample = f.read(sample_size)
+        complete = not f.read(1)
+
+    # Byte order marks are decisive
+    if sample.startswith(b"\xef\xbb\xbf"):
+        return "utf-8-sig", 1.0, "UTF-8 BOM"
+    if sample.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "utf-16", 1.0, "UTF-16 BOM"
+
+    # UTF-16 without a BOM: ASCII text leaves every other byte zero
+    if sample:
+        even, odd = sample[0::2], sample[1::2]
+        if odd.count(0) > 0.3 * len(odd) and not even.count(0):
+            return "utf-16-le", 0.9, "zero high bytes"
+        if even.count(0) > 0.3 * len(even) and not odd.count(0):
+            return "utf-16-be", 0.9, "zero high bytes"
+
+    # UTF-8 validity; a multi-byte sequence cut at the sample end is fine
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=complete)
+    except UnicodeDecodeError:
+        pass
+    else:
+        if not sample.isascii():
+            return "utf-8", 0.99, "valid multi-byte UTF-8"
+        if complete:
+            return "utf-8", 1.0, "plain ASCII"
+        return "utf-8", 0.9, f"plain ASCII in first {len(sample)} bytes"
+
+    # Single-byte code page: cp1252 prints 0x80-0x9F, latin1 maps them to
+    # control characters
+    high = {b for b in sample if 0x80 <= b <= 0x9F}
+    if high & CP1252_UNDEFINED:
+        return "latin1", 0.7, "bytes undefined in cp1252"
+    if high:
+        return "cp1252", 0.8, "cp1252 punctuation bytes"
+    return "latin1", 0.9, "8-bit text without C1 bytes"
+
+
+def roster_encoding(path, log_func=None):
+    """sniff_encoding with the decision reported to the log"""
+    enc, confidence, reason = sniff_encoding(path)
+    if log_func:
+        log_func(f"🔎 Detected encoding {enc} ({confidence:.0%} confidence: {reason})")
+    return enc
+
+
+def detect_columns(columns):
+    """Find the name and student-number columns, returns (name_col, id_col)
+    with None for a column that was not found"""
+    cols = {str(c).strip().lower(): c for c in columns}
+    name_col, id_col = None, None
+    for cand in ["name", "full name", "student name", "student"]:
+        if cand in cols:
+            name_col = cols[cand]
+            break
+    for cand in [
+        "student_number",
+        "student no",
+        "student_no",
+        "id",
+        "studentid",
+        "student number",
+    ]:
+        if cand in cols:
+            id_col = cols[cand]
+            break
+    return name_col, id_col
+
+
+class Roster:
+    """Columnar student list: parallel arrays of names and student numbers.
+    Iterating or indexing gives the {"name", "student_number"} dicts the rest
+    of the app works with; slicing gives a Roster."""
+
+    def __init__(self, names, numbers, duplicates=(), dropped=0):
+        self.names = names
+        self.numbers = numbers
+        self.duplicates = list(duplicates)  # numbers shared by different rows
+        self.dropped = dropped  # exact duplicate rows removed
+
+    @classmethod
+    def from_frame(cls, df, name_col, id_col, dedupe=True):
+        """Strip, filter blank names and missing IDs, and drop exact duplicate
+        rows as whole-column operations"""
+        names = df[name_col].fillna("").astype(str).str.strip()
+        ids = df[id_col].fillna("").astype(str).str.strip()
+        keep = names.ne("") & ids.ne("") & ids.str.lower().ne("nan")
+        names, ids = names[keep], ids[keep]
+        if not dedupe:
+            return cls(names.to_numpy(dtype=object), ids.to_numpy(dtype=object))
+
+        repeated = pd.DataFrame({"name": names, "id": ids}).duplicated()
+        names, ids = names[~repeated], ids[~repeated]
+        shared = ids[ids.duplicated()].unique()
+        return cls(
+            names.to_numpy(dtype=object),
+            ids.to_numpy(dtype=object),
+            duplicates=shared,
+            dropped=int(repeated.sum()),
+        )
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        for name, sid in zip(self.names, self.numbers):
+            yield {"name": name, "student_number": sid}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return Roster(self.names[index], self.numbers[index])
+        return {"name": self.names[index], "student_number": self.numbers[index]}
+
+
+def iter_students(path, log_func=None, chunksize=STREAM_CHUNK_ROWS):
+    """Stream student records from a roster without loading it whole.
+    CSV files are read in chunks and only the two detected columns are
+    parsed; Excel files are loaded with read_students. The file is opened
+    and its columns checked before this returns, so a bad roster raises
+    here rather than on the first record."""
     ext = os.path.splitext(path)[1].lower()
-    if ext in [".csv", ".txt"]:
+    if ext not in [".csv", ".txt"]:
+        return read_students(path, log_func)
+
+    # Like parse_students: if later bytes do not decode with the detected
+    # encoding, fall back to cp1252, then latin1 (which decodes every byte)
+    encodings = iter(
+        dict.fromkeys([roster_encoding(path, log_func), "cp1252", "latin1"])
+    )
+
+    def open_reader():
+        """(encoding, chunk reader, name column, ID column) for the first
+        encoding that reads the header"""
         for enc in encodings:
             try:
-                df = pd.read_csv(path, dtype=str, encoding=enc)
-                if log_func:
-                    log_func(f"Successfully read file with encoding: {enc}")
-                break
+                header = pd.read_csv(path, dtype=str, encoding=enc, nrows=0)
+                name_col, id_col = detect_columns(header.columns)
+                if name_col is None or id_col is None:
+                    raise ValueError(
+                        "❌ Missing required columns in student file! Expected 'name' and 'student_number'."
+                    )
+                reader = pd.read_csv(
+                    path,
+                    dtype=str,
+                    encoding=enc,
+                    usecols=[name_col, id_col],
+                    chunksize=chunksize,
+                )
+                return enc, reader, name_col, id_col
             except UnicodeDecodeError:
                 if log_func:
                     log_func(f"Failed to read file with encoding: {enc}")
-        else:
-            err_msg = "Failed to decode file with all tried encodings."
+        raise ValueError("File could not be decoded")  # latin1 never gets here
+
+    def stream(enc, reader, name_col, id_col):
+        rows = count = 0  # records parsed so far, and students among them
+        skip = 0  # records a reopened reader has to pass over again
+        while True:
+            try:
+                chunk = next(reader, None)
+            except UnicodeDecodeError:
+                if log_func:
+                    log_func(
+                        f"Failed to read file with encoding {enc} after row {rows}"
+                    )
+                # Blank lines and quoted line breaks make physical lines differ
+                # from records, so the restart skips parsed records
+                enc, reader, name_col, id_col = open_reader()
+                skip = rows
+                continue
+            if chunk is None:
+                break
+            if skip:
+                passed = min(skip, len(chunk))
+                chunk, skip = chunk.iloc[passed:], skip - passed
+            rows += len(chunk)
+            students = Roster.from_frame(chunk, name_col, id_col, dedupe=False)
+            count += len(students)
+            yield from students
+        if log_func:
+            log_func(f"Streamed {count} students with encoding: {enc}")
+
+    return stream(*open_reader())
+
+
+class LoadCancelled(Exception):
+    """Raised inside a roster load once its cancel event is set"""
+
+
+def _load_step(rows, total, progress, cancel):
+    if cancel is not None and cancel.is_set():
+        raise LoadCancelled()
+    if progress:
+        progress(rows, total)
+
+
+def read_roster_csv(path, encoding, progress=None, cancel=None):
+    """Parse a CSV roster in chunks, only materialising the name and ID
+    columns when both are present"""
+    header = pd.read_csv(path, dtype=str, encoding=encoding, nrows=0)
+    name_col, id_col = detect_columns(header.columns)
+    usecols = (
+        [name_col, id_col] if name_col is not None and id_col is not None else None
+    )
+    frames, rows = [], 0
+    for chunk in pd.read_csv(
+        path,
+        dtype=str,
+        encoding=encoding,
+        usecols=usecols,
+        chunksize=STREAM_CHUNK_ROWS,
+    ):
+        frames.append(chunk)
+        rows += len(chunk)
+        _load_step(rows, None, progress, cancel)
+    return pd.concat(frames, ignore_index=True) if frames else header
+
+
+def _cell_text(value):
+    """Excel cell value as the text read_excel(dtype=str) would give"""
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def read_roster_xlsx(path, progress=None, cancel=None):
+    """Stream an .xlsx roster's rows with openpyxl, keeping only the name and
+    ID columns"""
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        rows = ws.iter_rows(values_only=True)
+        columns = ["" if h is None else str(h) for h in next(rows, None) or ()]
+        name_col, id_col = detect_columns(columns)
+        if name_col is None or id_col is None:
+            return pd.DataFrame(columns=columns)
+        name_at, id_at = columns.index(name_col), columns.index(id_col)
+        total = (ws.max_row or 1) - 1 or None
+
+        names, ids, count = [], [], 0
+        for row in rows:
+            names.append(_cell_text(row[name_at]) if name_at < len(row) else None)
+            ids.append(_cell_text(row[id_at]) if id_at < len(row) else None)
+            count += 1
+            if count % 1000 == 0:
+                _load_step(count, total, progress, cancel)
+        _load_step(count, total, progress, cancel)
+        return pd.DataFrame({name_col: names, id_col: ids}, dtype=object)
+    finally:
+        wb.close()
+
+
+# ---------------- Roster cache ----------------
+def roster_cache_key(path):
+    """Cache key for a roster file: its path, size, mtime and content hash"""
+    st = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    ident = (
+        f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{digest.hexdigest()}"
+    )
+    return hashlib.sha256(ident.encode("utf-8")).hexdigest()
+
+
+def _pack_column(values):
+    """Store a string column as one NUL-separated UTF-8 byte array"""
+    return np.frombuffer("\0".join(values).encode("utf-8"), dtype=np.uint8)
+
+
+def _unpack_column(data, count):
+    if not count:
+        return np.array([], dtype=object)
+    return np.array(data.tobytes().decode("utf-8").split("\0"), dtype=object)
+
+
+def load_cached_roster(key):
+    """Roster stored under key, or None on a miss or unreadable entry"""
+    path = os.path.join(ROSTER_CACHE_DIR, key + ".npz")
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            count = int(data["count"])
+            students = Roster(
+                _unpack_column(data["names"], count),
+                _unpack_column(data["numbers"], count),
+                duplicates=_unpack_column(data["duplicates"], int(data["shared"])),
+                dropped=int(data["dropped"]),
+            )
+        os.utime(path)  # recently used entries are evicted last
+        return students
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Truncated or corrupt entry (BadZipFile, EOFError, zlib.error...):
+        # drop it so the roster is parsed and cached again
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+
+def save_cached_roster(key, students):
+    """Store a parsed roster and evict the oldest entries over the limit"""
+    columns = [students.names, students.numbers, students.duplicates]
+    if any("\0" in value for column in columns for value in column):
+        return  # the separator cannot round-trip
+    os.makedirs(ROSTER_CACHE_DIR, exist_ok=True)
+    path = os.path.join(ROSTER_CACHE_DIR, key + ".npz")
+    with open(path + ".tmp", "wb") as f:
+        np.savez(
+            f,
+            names=_pack_column(students.names),
+            numbers=_pack_column(students.numbers),
+            duplicates=_pack_column(students.duplicates),
+            count=len(students),
+            shared=len(students.duplicates),
+            dropped=students.dropped,
+        )
+    os.replace(path + ".tmp", path)
+
+    entries = [
+        os.path.join(ROSTER_CACHE_DIR, name)
+        for name in os.listdir(ROSTER_CACHE_DIR)
+        if name.endswith(".npz")
+    ]
+    entries.sort(key=os.path.getmtime)
+    for old in entries[:-ROSTER_CACHE_ENTRIES]:
+        os.remove(old)
+
+
+def read_students(path, log_func=None, progress=None, cancel=None):
+    """Load a roster through the on-disk cache, parsing it on a miss.
+    progress(rows, total or None) is called while parsing; setting the
+    cancel event aborts the load with LoadCancelled."""
+    try:
+        key = roster_cache_key(path)
+        students = load_cached_roster(key)
+    except OSError:
+        key, students = None, None
+    if students is not None:
+        if log_func:
+            log_func("⚡ Roster unchanged, loaded from cache.")
+    else:
+        students = parse_students(path, log_func, progress, cancel)
+        if key:
+            try:
+                save_cached_roster(key, students)
+            except OSError as e:
+                if log_func:
+                    log_func(f"⚠️ Could not cache roster: {e}")
+
+    if log_func:
+        if students.dropped:
+            log_func(f"⚠️ Dropped {students.dropped} exact duplicate row(s).")
+        if students.duplicates:
+            shown = ", ".join(students.duplicates[:10])
+            more = len(students.duplicates) - 10
+            log_func(
+                f"⚠️ Duplicate student numbers: {shown}"
+                + (f" (+{more} more)" if more > 0 else "")
+            )
+        log_func(f"Loaded {len(students)} students successfully.")
+    return students
+
+
+def parse_students(path, log_func=None, progress=None, cancel=None):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in [".csv", ".txt"]:
+        enc = roster_encoding(path, log_func)
+        try:
+            df = read_roster_csv(path, enc, progress, cancel)
+        except UnicodeDecodeError:
+            # The sample looked like UTF-8 but later bytes are not; cp1252
+            # decodes nearly every byte, latin1 every byte
             if log_func:
-                log_func(err_msg)
-            messagebox.showerror("Encoding Error", err_msg)
-            raise ValueError(err_msg)
+                log_func(f"Failed to read file with encoding: {enc}")
+            try:
+                enc = "cp1252"
+                df = read_roster_csv(path, enc, progress, cancel)
+            except UnicodeDecodeError:
+                enc = "latin1"
+                df = read_roster_csv(path, enc, progress, cancel)
+        if log_func:
+            log_func(f"Successfully read file with encoding: {enc}")
     elif ext in [".xls", ".xlsx"]:
         try:
-            df = pd.read_excel(path, dtype=str)
+            if ext == ".xlsx":
+                df = read_roster_xlsx(path, progress, cancel)
+            else:
+                df = pd.read_excel(path, dtype=str)
+                _load_step(len(df), len(df), progress, cancel)
             if log_func:
                 log_func("Successfully read Excel file.")
+        except LoadCancelled:
+            raise
         except Exception as e:
             err_msg = f"Failed to read Excel file: {e}"
             if log_func:
                 log_func(err_msg)
-            messagebox.showerror("File Read Error", err_msg)
-            raise
+            raise ValueError(err_msg) from e
     else:
         err_msg = "Unsupported file type. Use CSV or Excel."
         if log_func:
             log_func(err_msg)
-        messagebox.showerror("File Type Error", err_msg)
         raise ValueError(err_msg)
 
     # ---------------- Column Detection ----------------
-    cols = {c.strip().lower(): c for c in df.columns}
-    name_col, id_col = None, None
-    for cand in ["name", "full name", "student name", "student"]:
-        if cand in cols:
-            name_col = cols[cand]
-            break
-    for cand in [
-        "student_number",
-        "student no",
-        "student_no",
-        "id",
-        "studentid",
-        "student number",
-    ]:
-        if cand in cols:
-            id_col = cols[cand]
-            break
+    name_col, id_col = detect_columns(df.columns)
 
     # ---------------- Error if placeholders missing ----------------
     if name_col is None or id_col is None:
         err_msg = "❌ Missing required columns in student file! Expected 'name' and 'student_number'."
         if log_func:
             log_func(err_msg)
-        messagebox.showerror("Column Error", err_msg)
         raise ValueError(err_msg)
 
     # ---------------- Load Students ----------------
-    students = []
-    for _, row in df.iterrows():
-        name = str(row.get(name_col, "")).strip()
-        sid = str(row.get(id_col, "")).strip()
-        if name and sid and sid.lower() != "nan":
-            students.append({"name": name, "student_number": sid})
-
-    if log_func:
-        log_func(f"Loaded {len(students)} students successfully.")
-    return students
+    return Roster.from_frame(df, name_col, id_col)
 
 
 def kill_word():
@@ -155,79 +653,182 @@ def kill_word():
         time.sleep(1)
 
 
-def convert_with_word(docx_path, pdf_path, log_func=None):
-    """Convert DOCX to PDF using Microsoft Word (Windows only)"""
-    if not sys.platform.startswith("win"):
-        if log_func:
-            log_func("⚠️ Microsoft Word conversion only available on Windows")
-        return False
+# ---------------- PDF Converter Session ----------------
+class ConverterBackend:
+    """One DOCX→PDF engine (Word, a headless office process, a stub...).
+    ConverterSession starts it once and feeds it a whole batch."""
 
-    try:
+    name = "converter"
+
+    def start(self):
+        pass
+
+    def convert(self, docx_path, pdf_path):
+        """Convert one file, raise on failure"""
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+
+class WordBackend(ConverterBackend):
+    """Microsoft Word through COM (Windows only)"""
+
+    name = "Microsoft Word"
+
+    def __init__(self):
+        self.word = None
+
+    def start(self):
         import win32com.client
         import pythoncom
 
-        if log_func:
-            log_func(
-                f"📤 Converting with Microsoft Word: {os.path.basename(docx_path)}"
-            )
-
-        # Initialize COM
         pythoncom.CoInitialize()
+        self.word = win32com.client.Dispatch("Word.Application")
+        self.word.Visible = False
+        self.word.DisplayAlerts = False
 
-        # Create Word application
-        word = None
-        doc = None
-
+    def convert(self, docx_path, pdf_path):
+        doc = self.word.Documents.Open(os.path.abspath(docx_path), ReadOnly=True)
         try:
-            word = win32com.client.Dispatch("Word.Application")
-            word.Visible = False
-            word.DisplayAlerts = False
+            doc.SaveAs(os.path.abspath(pdf_path), FileFormat=17)  # 17 = PDF format
+        finally:
+            doc.Close(False)
 
-            # Open document
-            doc = word.Documents.Open(os.path.abspath(docx_path))
+    def stop(self):
+        import pythoncom
 
-            # Save as PDF
-            doc.SaveAs(os.path.abspath(pdf_path), FileFormat=17)  # 17 = PDF format
+        if self.word:
+            try:
+                self.word.Quit()
+            except Exception:
+                pass
+            self.word = None
+        pythoncom.CoUninitialize()
+
+
+class StubBackend(ConverterBackend):
+    """Backend for Linux and tests: records every call with its duration and
+    writes a placeholder PDF."""
+
+    name = "stub"
+    PDF_BYTES = (
+        b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+        b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+        b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>endobj\n"
+        b"xref\n0 4\n0000000000 65535 f \n0000000009 00000 n \n"
+        b"0000000052 00000 n \n0000000101 00000 n \n"
+        b"trailer<</Size 4/Root 1 0 R>>\nstartxref\n164\n%%EOF\n"
+    )
 
-            # Close document
-            doc.Close()
+    def __init__(self, fail_on=()):
+        self.calls = []  # (method, argument, seconds)
+        self.fail_on = set(fail_on)
 
-            success = True
-            if log_func:
-                log_func(
-                    f"✅ Microsoft Word conversion successful: {os.path.basename(pdf_path)}"
-                )
+    def _record(self, method, arg, started):
+        self.calls.append((method, arg, time.perf_counter() - started))
 
-        except Exception as e:
-            if log_func:
-                log_func(f"❌ Microsoft Word conversion error: {str(e)[:100]}")
-            success = False
+    def start(self):
+        self._record("start", None, time.perf_counter())
 
+    def convert(self, docx_path, pdf_path):
+        started = time.perf_counter()
+        try:
+            if os.path.basename(docx_path) in self.fail_on:
+                raise RuntimeError(f"stub failure for {docx_path}")
+            with open(pdf_path, "wb") as f:
+                f.write(self.PDF_BYTES)
         finally:
-            # Clean up
-            if doc:
+            self._record("convert", docx_path, started)
+
+    def stop(self):
+        self._record("stop", None, time.perf_counter())
+
+
+def default_converter():
+    """Backend factory for this platform, or None when no converter exists"""
+    if sys.platform.startswith("win"):
+        return WordBackend
+    return None
+
+
+class ConverterSession:
+    """Keeps one converter backend running for a whole batch. The backend is
+    restarted after a crash (and the file retried once) or every
+    restart_every documents to keep long runs from leaking memory. If the
+    backend cannot be started the session is marked unavailable and every
+    later convert() fails at once, so callers go straight to their fallback."""
+
+    def __init__(self, backend_factory, restart_every=200, log_func=None):
+        self.backend_factory = backend_factory
+        self.restart_every = restart_every
+        self.log_func = log_func
+        self.backend = None
+        self.converted = 0
+        self.restarts = 0
+        self.available = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _log(self, msg):
+        if self.log_func:
+            self.log_func(msg)
+
+    def _start(self):
+        self.backend = self.backend_factory()
+        self.backend.start()
+        self.converted = 0
+
+    def _restart(self):
+        self.close()
+        self.restarts += 1
+        self._start()
+
+    def convert(self, docx_path, pdf_path):
+        """Convert one file, returns True on success"""
+        for attempt in (1, 2):
+            if not self.available:
+                return False
+            try:
+                if self.backend is None:
+                    self._start()
+                elif self.restart_every and self.converted >= self.restart_every:
+                    self._restart()
+            except Exception as e:
+                name = self.backend.name if self.backend else "converter"
+                self._log(f"❌ Could not start {name}: {str(e)[:100]}")
+                self._log("⚠️ Converter unavailable, using simple PDFs for the rest")
+                self.available = False
                 try:
-                    doc.Close()
-                except:
+                    self.close()
+                except Exception:
                     pass
-            if word:
+                return False
+            try:
+                self.backend.convert(docx_path, pdf_path)
+                self.converted += 1
+                return True
+            except Exception as e:
+                name = self.backend.name if self.backend else "converter"
+                self._log(f"❌ {name} error: {str(e)[:100]}")
                 try:
-                    word.Quit()
-                except:
+                    self.close()
+                except Exception:
                     pass
-            pythoncom.CoUninitialize()
-
-        return success
-
-    except ImportError:
-        if log_func:
-            log_func("⚠️ win32com not available for Microsoft Word conversion")
-        return False
-    except Exception as e:
-        if log_func:
-            log_func(f"❌ Microsoft Word error: {str(e)[:100]}")
+                if attempt == 1:
+                    self._log(f"🔄 Restarting {name}...")
+                    self.restarts += 1
         return False
 
+    def close(self):
+        if self.backend is not None:
+            backend, self.backend = self.backend, None
+            backend.stop()
+
 
 def create_simple_pdf(pdf_path, student_data, log_func=None):
     """Create a simple PDF as last resort"""
@@ -296,6 +897,929 @@ def create_simple_pdf(pdf_path, student_data, log_func=None):
         return False
 
 
+def create_simple_pdf_batch(pdf_path, students, log_func=None):
+    """Write the simple fallback certificate for every student as pages of one
+    PDF. Fonts and the static border/text are emitted once as a shared form
+    XObject; each page only adds the student's own lines."""
+    try:
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfgen import canvas
+        from reportlab.lib.units import inch
+    except ImportError:
+        if log_func:
+            log_func("⚠️ reportlab not available for simple PDF")
+        return False
+
+    try:
+        if log_func:
+            log_func(f"📤 Creating simple PDF batch: {os.path.basename(pdf_path)}")
+        c = canvas.Canvas(pdf_path, pagesize=letter)
+        width, height = letter
+
+        # Static content shared by every page
+        c.beginForm("static")
+        c.setFont("Helvetica", 12)
+        c.drawString(
+            1 * inch,
+            height - 2.5 * inch,
+            "This document certifies successful completion",
+        )
+        c.drawString(1 * inch, height - 2.8 * inch, "of the course requirements.")
+        c.rect(0.5 * inch, 0.5 * inch, width - 1 * inch, height - 1 * inch)
+        c.endForm()
+
+        for student_data in students:
+            c.doForm("static")
+            c.setFont("Helvetica-Bold", 24)
+            c.drawString(
+                1 * inch,
+                height - 1 * inch,
+                f"Certificate for {student_data.get('name', '')}",
+            )
+            c.setFont("Helvetica", 14)
+            c.drawString(
+                1 * inch, height - 1.8 * inch, f"Date: {student_data.get('date', '')}"
+            )
+            c.showPage()
+        c.save()
+        return True
+
+    except Exception as e:
+        if log_func:
+            log_func(f"❌ Simple PDF batch error: {str(e)[:100]}")
+        return False
+
+
+# ---------------- Streaming PDF Merge ----------------
+class StreamingPdfMerger:
+    """Merges PDFs by opening each one once and writing its pages straight to
+    the output file. A file that fails to parse or has no pages is rejected
+    while it is appended, so there is no separate validation pass, and only
+    the current input is held in memory."""
+
+    def __init__(self, out_path):
+        self.out_path = out_path
+        self.f = open(out_path, "wb")
+        self.f.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+        self.offsets = [None]  # object number -> byte offset
+        self.pages_num = self._reserve()
+        self.catalog_num = self._reserve()
+        self.kids = []
+
+    def _reserve(self):
+        self.offsets.append(None)
+        return len(self.offsets) - 1
+
+    def _write(self, num, obj):
+        self.offsets[num] = self.f.tell()
+        self.f.write(b"%d 0 obj\n" % num)
+        obj.write_to_stream(self.f, None)
+        self.f.write(b"\nendobj\n")
+
+    def append(self, path):
+        """Append every page of path, returns the page count.
+        Raises ValueError for unreadable or empty PDFs."""
+        try:
+            reader = PyPDF2.PdfReader(path, strict=False)
+            if reader.is_encrypted:
+                raise ValueError("encrypted PDF")
+            pages = list(reader.pages)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(str(e)[:100]) from e
+        if not pages:
+            raise ValueError("no pages")
+
+        mapping, queue = {}, []
+        pages_ref = generic.IndirectObject(self.pages_num, 0, None)
+
+        def ref(indirect):
+            key = (indirect.idnum, indirect.generation)
+            if key not in mapping:
+                target = indirect.get_object()
+                if (
+                    isinstance(target, generic.DictionaryObject)
+                    and target.get("/Type") == "/Pages"
+                ):
+                    return pages_ref  # never copy the source page tree
+                mapping[key] = self._reserve()
+                queue.append((mapping[key], target))
+            return generic.IndirectObject(mapping[key], 0, None)
+
+        def convert(obj):
+            if isinstance(obj, generic.IndirectObject):
+                return ref(obj)
+            if isinstance(obj, generic.StreamObject):
+                new = obj.__class__()
+                new._data = obj._data
+            elif isinstance(obj, generic.DictionaryObject):
+                new = generic.DictionaryObject()
+            elif isinstance(obj, generic.ArrayObject):
+                return generic.ArrayObject(convert(item) for item in obj)
+            else:
+                return obj
+            for key, value in obj.items():
+                new[generic.NameObject(key)] = convert(value)
+            return new
+
+        # Register the pages first so links between them resolve to the copies
+        page_nums = []
+        for page in pages:
+            indirect = page.indirect_reference
+            num = self._reserve()
+            if indirect is not None:
+                mapping[(indirect.idnum, indirect.generation)] = num
+            page_nums.append(num)
+        for num, page in zip(page_nums, pages):
+            new_page = convert(page)
+            new_page[generic.NameObject("/Parent")] = pages_ref
+            self._write(num, new_page)
+            while queue:
+                num, obj = queue.pop()
+                self._write(num, convert(obj))
+        self.kids += page_nums
+        return len(pages)
+
+    def close(self):
+        kids = generic.ArrayObject(
+            generic.IndirectObject(n, 0, None) for n in self.kids
+        )
+        pages = generic.DictionaryObject()
+        pages[generic.NameObject("/Type")] = generic.NameObject("/Pages")
+        pages[generic.NameObject("/Kids")] = kids
+        pages[generic.NameObject("/Count")] = generic.NumberObject(len(self.kids))
+        self._write(self.pages_num, pages)
+        catalog = generic.DictionaryObject()
+        catalog[generic.NameObject("/Type")] = generic.NameObject("/Catalog")
+        catalog[generic.NameObject("/Pages")] = generic.IndirectObject(
+            self.pages_num, 0, None
+        )
+        self._write(self.catalog_num, catalog)
+
+        xref = self.f.tell()
+        self.f.write(b"xref\n0 %d\n" % len(self.offsets))
+        self.f.write(b"0000000000 65535 f \n")
+        for offset in self.offsets[1:]:
+            if offset is None:  # reserved by a file that failed mid-copy
+                self.f.write(b"0000000000 00000 f \n")
+            else:
+                self.f.write(b"%010d 00000 n \n" % offset)
+        self.f.write(
+            b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(self.offsets), self.catalog_num, xref)
+        )
+        self.f.close()
+
+    def abort(self):
+        try:
+            self.f.close()
+        finally:
+            if os.path.exists(self.out_path):
+                os.remove(self.out_path)
+
+
+# ---------------- Template Preflight ----------------
+_placeholder_cache = {}
+_placeholder_lock = threading.Lock()
+
+
+def template_placeholders(template_bytes):
+    """Placeholders used by a template, cached by the template's SHA-256 hash"""
+    key = hashlib.sha256(template_bytes).hexdigest()
+    with _placeholder_lock:
+        cached = _placeholder_cache.get(key)
+    if cached is None:
+        tpl = docxtpl.DocxTemplate(io.BytesIO(template_bytes))
+        cached = frozenset(tpl.get_undeclared_template_variables())
+        with _placeholder_lock:
+            _placeholder_cache[key] = cached
+    return cached
+
+
+def preflight_template(template_path):
+    """Load and check a template once before generation.
+    Returns (compiled template, missing required placeholders)"""
+    tpl = CompiledTemplate(template_path)
+    missing = REQUIRED_PLACEHOLDERS - tpl.placeholders
+    return tpl, missing
+
+
+# ---------------- Package Writer ----------------
+class PackageWriter:
+    """Writes DOCX zips that differ from a template only in a few parts.
+    Untouched members are copied as already-compressed bytes, so only the
+    rendered parts are deflated for each output."""
+
+    def __init__(self, template_bytes, templated_names):
+        self.templated_names = set(templated_names)
+        self.entries = []
+        with zipfile.ZipFile(io.BytesIO(template_bytes)) as zf:
+            infos = zf.infolist()
+        if len(infos) >= 0xFFFF:
+            raise ValueError("Too many zip members")
+        for info in infos:
+            if info.flag_bits & 0x1:
+                raise ValueError("Encrypted zip members are not supported")
+            if (
+                max(info.file_size, info.compress_size, info.header_offset)
+                >= 0xFFFFFFFF
+            ):
+                raise ValueError("Zip64 members are not supported")
+            name = info.filename.encode("utf-8" if info.flag_bits & 0x800 else "cp437")
+            if info.filename in self.templated_names:
+                self.entries.append((info, name, None))
+                continue
+            # Skip the local header to reach the compressed data
+            offset = info.header_offset
+            name_len, extra_len = struct.unpack(
+                "<2H", template_bytes[offset + 26 : offset + 30]
+            )
+            start = offset + 30 + name_len + extra_len
+            raw = template_bytes[start : start + info.compress_size]
+            self.entries.append((info, name, raw))
+
+    @staticmethod
+    def _dos_time(info):
+        y, mo, d, h, mi, sec = info.date_time
+        return (h << 11) | (mi << 5) | (sec // 2), ((y - 1980) << 9) | (mo << 5) | d
+
+    def build(self, parts):
+        """Assemble a zip from the template members and rendered {name: bytes}"""
+        out, central = [], []
+        offset = 0
+        for info, name, raw in self.entries:
+            if raw is None:
+                data = parts[info.filename]
+                compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+                raw = compressor.compress(data) + compressor.flush()
+                method, crc, size = zipfile.ZIP_DEFLATED, zlib.crc32(data), len(data)
+            else:
+                method, crc, size = info.compress_type, info.CRC, info.file_size
+            flags = info.flag_bits & 0x800
+            dostime, dosdate = self._dos_time(info)
+            header = struct.pack(
+                "<4s5H3L2H",
+                b"PK\x03\x04",
+                20,
+                flags,
+                method,
+                dostime,
+                dosdate,
+                crc,
+                len(raw),
+                size,
+                len(name),
+                0,
+            )
+            central.append(
+                struct.pack(
+                    "<4s6H3L5H2L",
+                    b"PK\x01\x02",
+                    20,
+                    20,
+                    flags,
+                    method,
+                    dostime,
+                    dosdate,
+                    crc,
+                    len(raw),
+                    size,
+                    len(name),
+                    0,
+                    0,
+                    0,
+                    info.internal_attr,
+                    info.external_attr,
+                    offset,
+                )
+                + name
+            )
+            out += [header, name, raw]
+            offset += len(header) + len(name) + len(raw)
+        directory = b"".join(central)
+        end = struct.pack(
+            "<4s4H2LH",
+            b"PK\x05\x06",
+            0,
+            0,
+            len(central),
+            len(central),
+            len(directory),
+            offset,
+            0,
+        )
+        return b"".join(out) + directory + end
+
+
+# ---------------- Compiled Template ----------------
+class CompiledTemplate:
+    """DOCX template that is unzipped, patched and compiled once, then rendered
+    for every student from the cached state instead of re-opening the file."""
+
+    XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+    FOOTNOTES_TYPE = (
+        "application/vnd.openxmlformats-officedocument"
+        ".wordprocessingml.footnotes+xml"
+    )
+
+    def __init__(self, template_path):
+        self.template_path = template_path
+        with open(template_path, "rb") as f:
+            self.template_bytes = f.read()
+        self.file_hash = hashlib.sha256(self.template_bytes).hexdigest()
+
+        self.tpl = docxtpl.DocxTemplate(io.BytesIO(self.template_bytes))
+        self.tpl.init_docx()
+        # Escape values so names like "A & B" still produce valid XML
+        self.jinja_env = jinja2.Environment(autoescape=True)
+
+        # Raw zip members, kept in their original order
+        with zipfile.ZipFile(io.BytesIO(self.template_bytes)) as zf:
+            self.members = [(info, zf.read(info.filename)) for info in zf.infolist()]
+
+        docx = self.tpl.docx
+
+        # Body: split document.xml around <w:body> and compile the body once
+        self.document_part = docx.part.partname.lstrip("/")
+        root = copy.deepcopy(docx.element)
+        body = root.body
+        root.replace(body, etree.Comment("FAMS_BODY"))
+        head, tail = etree.tostring(root, encoding="unicode").split("<!--FAMS_BODY-->")
+        self.document_head = self.XML_DECLARATION + head.encode("utf-8")
+        self.document_tail = tail.encode("utf-8")
+        body_xml = self.tpl.patch_xml(self.tpl.get_xml())
+        self.sources = [body_xml]
+        self.body_template = self._compile(body_xml)
+
+        # Headers, footers and footnotes: one compiled template per part
+        self.part_templates = {}
+        for rel in docx.part.rels.values():
+            if rel.is_external:
+                continue
+            if rel.reltype in (self.tpl.HEADER_URI, self.tpl.FOOTER_URI):
+                part = rel.target_part
+                if not part.blob:
+                    continue
+                xml = self.tpl.patch_xml(self.tpl.get_part_xml(part))
+                self.sources.append(xml)
+                self.part_templates[part.partname.lstrip("/")] = (
+                    self._compile(xml),
+                    self.XML_DECLARATION,
+                    True,
+                )
+        self.footnotes_part = None
+        for part in docx.part.package.parts:
+            if part.content_type == self.FOOTNOTES_TYPE:
+                self.footnotes_part = part.partname.lstrip("/")
+                xml = self.tpl.patch_xml(part.blob.decode("utf-8"))
+                self.sources.append(xml)
+                self.part_templates[part.partname.lstrip("/")] = (
+                    self._compile(xml),
+                    b"",
+                    True,
+                )
+        # What StreamingDocxMerger takes from each rendered student
+        self.merge_part_names = [self.document_part]
+        if self.footnotes_part:
+            self.merge_part_names.append(self.footnotes_part)
+
+        # Core properties (title, subject, ...) only when they use Jinja
+        for info, data in self.members:
+            if info.filename == "docProps/core.xml" and (
+                b"{{" in data or b"{%" in data
+            ):
+                self.sources.append(data.decode("utf-8"))
+                self.part_templates[info.filename] = (
+                    self.jinja_env.from_string(data.decode("utf-8")),
+                    b"",
+                    False,
+                )
+
+        templated = [self.document_part, *self.part_templates]
+        try:
+            self.package = PackageWriter(self.template_bytes, templated)
+        except ValueError:
+            self.package = None  # e.g. zip64 templates: use zipfile instead
+        self.fast_parts = self._build_fast_path()
+
+    def _compile(self, xml):
+        xml = re.sub(r"<w:p([ >])", r"\n<w:p\1", xml)
+        return self.jinja_env.from_string(xml)
+
+    def _finish(self, xml):
+        xml = re.sub(r"\n<w:p([ >])", r"<w:p\1", xml)
+        xml = (
+            xml.replace("{_{", "{{")
+            .replace("}_}", "}}")
+            .replace("{_%", "{%")
+            .replace("%_}", "%}")
+        )
+        return self.tpl.resolve_listing(xml)
+
+    @property
+    def placeholders(self):
+        return template_placeholders(self.template_bytes)
+
+    def _build_fast_path(self):
+        """For templates that only use plain {{ variable }} placeholders, render
+        once with sentinel values and pre-split every part into literal byte
+        segments and variable slots. Returns None if the template needs Jinja."""
+        names = []
+        for xml in self.sources:
+            if "{%" in xml or "{#" in xml:
+                return None
+            for expr in re.findall(r"\{\{(.*?)\}\}", xml, flags=re.DOTALL):
+                name = expr.strip()
+                if not SIMPLE_PLACEHOLDER.match(name):
+                    return None
+                if name not in names:
+                    names.append(name)
+        if b"FAMSSLOT" in self.template_bytes:
+            return None
+
+        sentinels = {name: f"FAMSSLOT{i}X" for i, name in enumerate(names)}
+        fast_parts = {}
+        for part_name, data in self._render_jinja(sentinels).items():
+            pieces = re.split(rb"FAMSSLOT(\d+)X", data)
+            literals = pieces[0::2]
+            slots = [names[int(i)] for i in pieces[1::2]]
+            fast_parts[part_name] = (literals, slots)
+        return fast_parts
+
+    def _render_fast(self, context):
+        values = {
+            name: str(markupsafe.escape(value)).encode("utf-8")
+            for name, value in context.items()
+        }
+        parts = {}
+        for part_name, (literals, slots) in self.fast_parts.items():
+            chunks = [literals[0]]
+            for slot, literal in zip(slots, literals[1:]):
+                chunks.append(values.get(slot, b""))
+                chunks.append(literal)
+            parts[part_name] = b"".join(chunks)
+        return parts
+
+    def render_parts(self, context):
+        """Render every templated part, returns {zip member name: bytes}"""
+        if self.fast_parts is not None and not any(
+            PLAIN_VALUE_BREAKERS.search(str(v)) for v in context.values()
+        ):
+            return self._render_fast(context)
+        return self._render_jinja(context)
+
+    def _render_jinja(self, context):
+        tree = self.tpl.fix_tables(self._finish(self.body_template.render(context)))
+        self.tpl.docx_ids_index = 1000
+        self.tpl.fix_docpr_ids(tree)
+        parts = {
+            self.document_part: self.document_head
+            + etree.tostring(tree, encoding="utf-8")
+            + self.document_tail
+        }
+        for name, (template, prefix, finish) in self.part_templates.items():
+            xml = template.render(context)
+            if finish:
+                xml = self._finish(xml)
+            parts[name] = prefix + xml.encode("utf-8")
+        return parts
+
+    def build(self, parts):
+        """Zip rendered parts together with the untouched template members"""
+        if self.package is not None:
+            return self.package.build(parts)
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zout:
+            for info, data in self.members:
+                zout.writestr(info, parts.get(info.filename, data))
+        return buf.getvalue()
+
+    def merge_parts(self, parts):
+        """The rendered parts StreamingDocxMerger.add needs"""
+        return {name: parts[name] for name in self.merge_part_names}
+
+    def save(self, context, out_path):
+        """Render to out_path, returns the rendered parts"""
+        parts = self.render_parts(context)
+        with open(out_path, "wb") as f:
+            f.write(self.build(parts))
+        return parts
+
+    def split_document(self, document_xml):
+        """Split a rendered document.xml into (body start tag, body content,
+        final section properties) for merging"""
+        body = document_xml[len(self.document_head) : -len(self.document_tail)]
+        start = body.index(b">") + 1
+        end = body.rindex(b"</w:body>")
+        sect = body.rfind(b"<w:sectPr", start, end)
+        if sect == -1 or b"</w:p>" in body[sect:end] or b"</w:tbl>" in body[sect:end]:
+            sect = end
+        return body[:start], body[start:sect], body[sect:end]
+
+
+# ---------------- Streaming DOCX Merge ----------------
+class StreamingDocxMerger:
+    """Streams rendered students into one DOCX as they come out of the
+    generation stage. Every student shares the template's styles and media,
+    so those members are written once and only each student's body is
+    appended to document.xml, separated by page breaks. Like Composer, each
+    student after the first gets its own numbering instances so lists start
+    again, and drawing, picture, bookmark and footnote ids are renumbered so
+    they stay unique."""
+
+    DOCPR_ID = re.compile(rb'(<wp:docPr\b[^>]*?\bid=")(\d+)(")')
+    PIC_ID = re.compile(rb'(<pic:cNvPr\b[^>]*?\bid=")(\d+)(")')
+    BOOKMARK_ID = re.compile(rb'(<w:bookmark(?:Start|End)\b[^>]*?\bw:id=")(\d+)(")')
+    NUM_ID = re.compile(rb'(<w:numId w:val=")(\d+)(")')
+    PPR = re.compile(rb"<w:pPr>.*?</w:pPr>", re.DOTALL)
+    FOOTNOTE = re.compile(rb"<w:footnote\b([^>]*)>.*?</w:footnote>", re.DOTALL)
+    FOOTNOTE_ID = re.compile(rb'(\bw:id=")(-?\d+)(")')
+    FOOTNOTE_REF = re.compile(rb'(<w:footnoteReference\b[^>]*?\bw:id=")(-?\d+)(")')
+    PAGE_BREAK = b'<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+    NUMBERING_REL = (
+        "http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering"
+    )
+    STYLES_REL = (
+        "http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"
+    )
+    W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+    def __init__(self, tpl, out_path, first_context):
+        self.tpl = tpl
+        self.out_path = out_path
+        self.count = 0
+        self.shape_id = 0
+        self.pic_id = 0
+        self.bookmark_id = 0
+        self.sect_pr = b""
+        self.ends_with_page_break = False
+
+        first_parts = tpl.render_parts(first_context)
+        parts = {
+            info.filename: first_parts.get(info.filename, data)
+            for info, data in tpl.members
+        }
+        self.numbering_part = self._related_part(self.NUMBERING_REL)
+        styles_part = self._related_part(self.STYLES_REL)
+        self._load_numbering(parts.get(self.numbering_part), parts.get(styles_part))
+        self._load_footnotes(parts.get(tpl.footnotes_part))
+
+        # numbering.xml and footnotes.xml grow with every student, so they
+        # are written by close()
+        self.zip = zipfile.ZipFile(out_path, "w", zipfile.ZIP_DEFLATED)
+        self.infos = {}
+        for info, data in tpl.members:
+            if info.filename in (self.numbering_part, tpl.footnotes_part):
+                self.infos[info.filename] = info
+            elif info.filename != tpl.document_part:
+                self.zip.writestr(info, parts[info.filename])
+        self.stream = self.zip.open(tpl.document_part, "w", force_zip64=True)
+
+    def _related_part(self, reltype):
+        """Zip member name of the document part related by reltype, or None"""
+        for rel in self.tpl.tpl.docx.part.rels.values():
+            if not rel.is_external and rel.reltype == reltype:
+                return rel.target_part.partname.lstrip("/")
+        return None
+
+    def _load_numbering(self, numbering_xml, styles_xml):
+        """Index the lists a student body can use: explicit numIds and
+        paragraph styles that carry numbering (headings excluded)"""
+        self.numbering = numbering_xml
+        self.num_abstract = {}  # numId -> abstractNumId
+        self.level_starts = {}  # abstractNumId -> [(ilvl, start)]
+        self.style_nums = {}  # numbered paragraph style id -> (numId, ilvl)
+        self.new_nums = []
+        self.next_num = 0
+        self.style_ref = None
+        if not numbering_xml:
+            return
+        w = self.W
+        root = etree.fromstring(numbering_xml)
+        for abstract in root.iter(w + "abstractNum"):
+            self.level_starts[abstract.get(w + "abstractNumId")] = [
+                (
+                    lvl.get(w + "ilvl"),
+                    start.get(w + "val") if start is not None else "1",
+                )
+                for lvl in abstract.iter(w + "lvl")
+                for start in [lvl.find(w + "start")]
+            ]
+        for num in root.iter(w + "num"):
+            num_id = num.get(w + "numId")
+            abstract = num.find(w + "abstractNumId")
+            if abstract is not None:
+                self.num_abstract[num_id] = abstract.get(w + "val")
+            self.next_num = max(self.next_num, int(num_id))
+        if not styles_xml:
+            return
+        for style in etree.fromstring(styles_xml).iter(w + "style"):
+            num_id = style.find(f"{w}pPr/{w}numPr/{w}numId")
+            if (
+                style.get(w + "type") != "paragraph"
+                or num_id is None
+                or style.find(f"{w}pPr/{w}outlineLvl") is not None
+            ):
+                continue
+            ilvl = style.find(f"{w}pPr/{w}numPr/{w}ilvl")
+            self.style_nums[style.get(w + "styleId")] = (
+                num_id.get(w + "val"),
+                ilvl.get(w + "val") if ilvl is not None else "0",
+            )
+        if self.style_nums:
+            names = b"|".join(re.escape(s.encode()) for s in self.style_nums)
+            self.style_ref = re.compile(rb'<w:pStyle w:val="(' + names + rb')"/>')
+
+    def _load_footnotes(self, footnotes_xml):
+        """Keep the separator footnotes; every student's own footnotes are
+        collected in a temporary file and written after them by close()"""
+        self.footnotes = None
+        if not footnotes_xml:
+            return
+        notes = list(self.FOOTNOTE.finditer(footnotes_xml))
+        start = notes[0].start() if notes else footnotes_xml.rindex(b"</w:footnotes>")
+        special = [m.group(0) for m in notes if b"w:type=" in m.group(1)]
+        self.footnotes_head = footnotes_xml[:start] + b"".join(special)
+        ids = [int(self.FOOTNOTE_ID.search(note).group(2)) for note in special]
+        self.footnote_id = max(ids, default=0)
+        self.footnotes = tempfile.TemporaryFile()
+
+    def _renumber_shape(self, m):
+        self.shape_id += 1
+        return m.group(1) + str(self.shape_id).encode() + m.group(3)
+
+    def _renumber_picture(self, m):
+        self.pic_id += 1
+        return m.group(1) + str(self.pic_id).encode() + m.group(3)
+
+    def _renumber_bookmarks(self, content):
+        """New bookmark ids, the same one for a bookmark's start and end"""
+        mapping = {}
+
+        def sub(m):
+            if m.group(2) not in mapping:
+                self.bookmark_id += 1
+                mapping[m.group(2)] = str(self.bookmark_id).encode()
+            return m.group(1) + mapping[m.group(2)] + m.group(3)
+
+        return self.BOOKMARK_ID.sub(sub, content)
+
+    def _restart_numbering(self, content):
+        """Point the body's lists at fresh w:num instances that start over,
+        so numbering does not continue from the previous student"""
+        fresh = {}
+
+        def restarted(num_id):
+            abstract = self.num_abstract.get(num_id)
+            if abstract is None or num_id == "0":
+                return num_id  # "0" means numbering switched off
+            if num_id not in fresh:
+                self.next_num += 1
+                overrides = "".join(
+                    f'<w:lvlOverride w:ilvl="{ilvl}">'
+                    f'<w:startOverride w:val="{start}"/></w:lvlOverride>'
+                    for ilvl, start in self.level_starts.get(abstract, [])
+                )
+                self.new_nums.append(
+                    f'<w:num w:numId="{self.next_num}">'
+                    f'<w:abstractNumId w:val="{abstract}"/>{overrides}</w:num>'
+                )
+                fresh[num_id] = str(self.next_num)
+            return fresh[num_id]
+
+        content = self.NUM_ID.sub(
+            lambda m: m.group(1) + restarted(m.group(2).decode()).encode() + m.group(3),
+            content,
+        )
+        if self.style_ref is None or not self.style_ref.search(content):
+            return content
+
+        def numbered_style(m):
+            ppr = m.group(0)
+            style = self.style_ref.search(ppr)
+            if style is None or b"<w:numPr>" in ppr:
+                return ppr
+            num_id, ilvl = self.style_nums[style.group(1).decode()]
+            num_pr = (
+                f'<w:numPr><w:ilvl w:val="{ilvl}"/>'
+                f'<w:numId w:val="{restarted(num_id)}"/></w:numPr>'
+            ).encode()
+            # numPr follows pStyle and the few properties that precede it
+            at = style.end()
+            for tag in (
+                b"<w:keepNext",
+                b"<w:keepLines",
+                b"<w:pageBreakBefore",
+                b"<w:framePr",
+                b"<w:widowControl",
+            ):
+                if ppr.startswith(tag, at):
+                    at = ppr.index(b">", at) + 1
+            return ppr[:at] + num_pr + ppr[at:]
+
+        return self.PPR.sub(numbered_style, content)
+
+    def _add_footnotes(self, content, footnotes_xml):
+        """Copy this student's footnotes with new ids and point the body's
+        references at them"""
+        mapping = {}
+        for note in self.FOOTNOTE.finditer(footnotes_xml):
+            if b"w:type=" in note.group(1):
+                continue
+            self.footnote_id += 1
+            old = self.FOOTNOTE_ID.search(note.group(1)).group(2)
+            mapping[old] = str(self.footnote_id).encode()
+            self.footnotes.write(
+                self.FOOTNOTE_ID.sub(
+                    lambda m: m.group(1) + mapping[old] + m.group(3), note.group(0), 1
+                )
+            )
+        return self.FOOTNOTE_REF.sub(
+            lambda m: m.group(1) + mapping.get(m.group(2), m.group(2)) + m.group(3),
+            content,
+        )
+
+    def add(self, parts):
+        """Append one student, given the parts picked by
+        CompiledTemplate.merge_parts"""
+        body_tag, content, sect_pr = self.tpl.split_document(
+            parts[self.tpl.document_part]
+        )
+        if self.count == 0:
+            self.stream.write(self.tpl.document_head + body_tag)
+            self.sect_pr = sect_pr
+        else:
+            if not self.ends_with_page_break:
+                self.stream.write(self.PAGE_BREAK)
+            if self.num_abstract:
+                content = self._restart_numbering(content)
+        last_p = max(content.rfind(b"<w:p>"), content.rfind(b"<w:p "))
+        self.ends_with_page_break = b'w:type="page"' in content[max(last_p, 0) :]
+        content = self.DOCPR_ID.sub(self._renumber_shape, content)
+        content = self.PIC_ID.sub(self._renumber_picture, content)
+        content = self._renumber_bookmarks(content)
+        if self.footnotes is not None and self.tpl.footnotes_part in parts:
+            content = self._add_footnotes(content, parts[self.tpl.footnotes_part])
+        self.stream.write(content)
+        self.count += 1
+
+    def _write_growing_parts(self):
+        if self.numbering_part in self.infos:
+            numbering = self.numbering
+            if self.new_nums:
+                # w:num elements go after every abstractNum, before the
+                # optional numIdMacAtCleanup
+                at = numbering.find(b"<w:numIdMacAtCleanup")
+                if at == -1:
+                    at = numbering.rindex(b"</w:numbering>")
+                numbering = (
+                    numbering[:at] + "".join(self.new_nums).encode() + numbering[at:]
+                )
+            self.zip.writestr(self.infos[self.numbering_part], numbering)
+        if self.footnotes is not None:
+            with self.zip.open(
+                self.infos[self.tpl.footnotes_part], "w", force_zip64=True
+            ) as out:
+                out.write(self.footnotes_head)
+                self.footnotes.seek(0)
+                for block in iter(lambda: self.footnotes.read(1 << 20), b""):
+                    out.write(block)
+                out.write(b"</w:footnotes>")
+
+    def close(self):
+        try:
+            if self.count:
+                self.stream.write(self.sect_pr + b"</w:body>" + self.tpl.document_tail)
+            self.stream.close()
+            self._write_growing_parts()
+            self.zip.close()
+        finally:
+            if self.footnotes is not None:
+                self.footnotes.close()
+        if not self.count:
+            os.remove(self.out_path)
+
+    def abort(self):
+        try:
+            self.stream.close()
+            self.zip.close()
+            if self.footnotes is not None:
+                self.footnotes.close()
+        finally:
+            if os.path.exists(self.out_path):
+                os.remove(self.out_path)
+
+
+# ---------------- Render Pool ----------------
+_process_template = None
+
+
+def _init_render_process(template_path):
+    """Pool initializer: every process compiles its own copy of the template"""
+    global _process_template
+    _process_template = CompiledTemplate(template_path)
+
+
+def _render_chunk(chunk, keep_document=False):
+    """Render a chunk of (index, context, out_path) jobs inside a pool process.
+    With keep_document the parts needed for merging are sent back;
+    jobs without an out_path are rendered in memory only."""
+    results = []
+    for index, context, out_path in chunk:
+        try:
+            if out_path:
+                parts = _process_template.save(context, out_path)
+            else:
+                parts = _process_template.render_parts(context)
+        except Exception as e:
+            results.append((index, out_path, str(e)[:150], None))
+            break
+        document = _process_template.merge_parts(parts) if keep_document else None
+        results.append((index, out_path, None, document))
+    return results
+
+
+def docx_filename(student):
+    safe_name = sanitize_filename(student["name"])
+    return f"{student['student_number']}_{safe_name}.docx"
+
+
+def student_record(student):
+    """Per-student record shared by the DOCX, PDF, merge and fallback stages"""
+    filename = docx_filename(student)
+    return {
+        "student": {
+            "name": student["name"],
+            "student_number": student["student_number"],
+        },
+        "docx": os.path.join(DOCX_OUT, filename),
+        "pdf": os.path.join(PDF_OUT, os.path.splitext(filename)[0] + ".pdf"),
+    }
+
+
+# ---------------- Build Manifest ----------------
+def output_hash(template_hash, student, *extra):
+    """Hash of everything a student's outputs are built from"""
+    data = "\0".join(
+        [template_hash, student["name"], student["student_number"], *extra]
+    )
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def load_manifest(path=MANIFEST_FILE):
+    """{DOCX file name: {"docx": hash, "pdf": hash}} recorded by the last
+    successful run. Each output carries the hash of the inputs it was built
+    from; entries in an older format count as out of date."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            outputs = json.load(f).get("outputs", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+    if not isinstance(outputs, dict):
+        return {}
+    return {name: entry for name, entry in outputs.items() if isinstance(entry, dict)}
+
+
+def save_manifest(outputs, path=MANIFEST_FILE):
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"version": 2, "outputs": outputs}, f)
+    os.replace(path + ".tmp", path)
+
+
+# ---------------- Roster Loader ----------------
+class RosterLoader(threading.Thread):
+    """Reads a student file off the UI thread. Every event is reported as
+    ui_callback(loader, **event): message, rows/total progress, and finally
+    exactly one of students, error or cancelled."""
+
+    def __init__(self, path, ui_callback):
+        super().__init__(daemon=True)
+        self.path = path
+        self.ui_callback = ui_callback
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            students = read_students(
+                self.path,
+                log_func=lambda m: self.ui_callback(self, message=m),
+                progress=lambda rows, total: self.ui_callback(
+                    self, rows=rows, total=total
+                ),
+                cancel=self._cancel,
+            )
+        except LoadCancelled:
+            self.ui_callback(self, cancelled=True)
+        except Exception as e:
+            self.ui_callback(self, error=str(e))
+        else:
+            self.ui_callback(self, students=students)
+
+
 # ---------------- Worker Class ----------------
 class Worker(threading.Thread):
     def __init__(
@@ -307,6 +1831,11 @@ class Worker(threading.Thread):
         gen_pdf=False,
         merge_docx=False,
         merge_pdf=False,
+        workers=1,
+        converter=None,
+        total=None,
+        sounds=True,
+        incremental=True,
     ):
         super().__init__()
         self.students = students
@@ -316,220 +1845,701 @@ class Worker(threading.Thread):
         self.gen_pdf = gen_pdf
         self.merge_docx = merge_docx
         self.merge_pdf = merge_pdf
+        self.workers = max(1, int(workers))
+        self.converter = converter if converter is not None else default_converter()
+        # students may be a lazy iterator (see iter_students); total is its
+        # row count when known, for progress
+        self.total = len(students) if hasattr(students, "__len__") else total
+        self.processed = 0  # students rendered or found up to date so far
+        self.sounds = sounds  # start/finish cues; off for headless runs
+        # Skip students whose outputs the manifest shows are up to date
+        self.incremental = incremental
+
+    def render_docx(self, tpl, jobs, count=None):
+        """Render (index, context, out_path) jobs, yielding
+        (index, out_path, error, merge parts or None) as each one finishes.
+        Jobs without an out_path are only rendered in memory (merged-only runs).
+        jobs may be a lazy iterator, count is its length when known. Large
+        runs are spread over a process pool with a bounded number of chunks
+        in flight."""
+        if self.workers == 1 or (count is not None and count < POOL_MIN_STUDENTS):
+            for index, context, out_path in jobs:
+                try:
+                    if out_path:
+                        parts = tpl.save(context, out_path)
+                    else:
+                        parts = tpl.render_parts(context)
+                except Exception as e:
+                    yield index, out_path, str(e)[:150], None
+                    return
+                document = tpl.merge_parts(parts) if self.merge_docx else None
+                yield index, out_path, None, document
+            return
 
-    def run(self):
-        play_wav("assets/sounds/Generating.wav")
-        total_steps = len(self.students)
-        if self.gen_docx:
-            total_steps += 1
-        if self.gen_pdf:
-            total_steps += 1
-        if self.merge_docx:
-            total_steps += 1
-        if self.merge_pdf:
-            total_steps += 1
-
-        current_step = 0
-        docx_files, pdf_files = [], []
-
-        # ---------------- Generate DOCX files ----------------
-        for s in self.students:
+        chunk_size = 50
+        if count is not None:
+            chunk_size = max(1, min(50, count // (self.workers * 4)))
+        jobs = iter(jobs)
+        chunks = iter(lambda: list(itertools.islice(jobs, chunk_size)), [])
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_render_process,
+            initargs=(self.template_path,),
+        ) as pool:
+            running = {
+                pool.submit(_render_chunk, chunk, self.merge_docx)
+                for chunk in itertools.islice(chunks, self.workers * 2)
+            }
             try:
-                tpl = DocxTemplate(self.template_path)
-                context = {
-                    "name": s["name"],
-                    "student_number": s["student_number"],
-                }
-                placeholders_in_template = tpl.get_undeclared_template_variables()
-                required = {"name", "student_number"}
-
-                missing_required = required - placeholders_in_template
-                if missing_required:
-                    self.ui_callback(
-                        progress=current_step / total_steps,
-                        message=f"❌ Template missing required placeholder(s): {', '.join(missing_required)}",
-                        error=True,
+                while running:
+                    finished, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        for result in future.result():
+                            yield result
+                        chunk = next(chunks, None)
+                        if chunk:
+                            running.add(
+                                pool.submit(_render_chunk, chunk, self.merge_docx)
+                            )
+            finally:
+                for future in running:
+                    future.cancel()
+
+    # ---------------- Pipeline helpers ----------------
+    def _progress(self):
+        if self._total is None:
+            return 0.0  # lazy roster of unknown length
+        return self._done / self._total if self._total else 1.0
+
+    def _log(self, message):
+        self.ui_callback(progress=self._progress(), message=message)
+
+    def _advance(self, message, units=1):
+        with self._lock:
+            self._done += units
+            progress = self._progress()
+        self.ui_callback(progress=progress, message=message)
+
+    def _fail(self, message):
+        """Report the first error and tell every stage to stop"""
+        with self._lock:
+            if self._stop.is_set():
+                return
+            self._stop.set()
+        self.ui_callback(progress=self._progress(), message=message, error=True)
+
+    def _convert_stage(self, in_q, out_q):
+        """PDF stage: converts each rendered DOCX as soon as it arrives"""
+        session = ConverterSession(self.converter, log_func=self._log)
+        total_files = self.total if self.total is not None else "?"
+        processed_files = 0
+        try:
+            for item in iter(in_q.get, None):
+                if self._stop.is_set():
+                    continue  # keep draining so the renderer never blocks
+                index, rec = item
+                if rec["pdf_fresh"]:
+                    rec["entry"]["pdf"] = rec["pdf_hash"]
+                    processed_files += 1
+                    self._advance(
+                        f"⏭️ PDF up to date ({processed_files}/{total_files})"
                     )
-                    return
+                    if out_q is not None:
+                        out_q.put(item)
+                    continue
+                f, pdf_path, student_data = rec["docx"], rec["pdf"], rec["student"]
+                pdf_name = os.path.basename(pdf_path)
+
+                # Method 1: persistent converter session (Microsoft Word on Windows)
+                success = session.convert(f, pdf_path) and pdf_ready(pdf_path)
+                if success:
+                    rec["entry"]["pdf"] = rec["pdf_hash"]
+                    self._log(f"✅ PDF created: {pdf_name}")
+
+                # Method 2: Simple PDF fallback, left out of the manifest so
+                # the next run tries the converter again
+                if not success:
+                    self._log(f"🔄 Creating simple PDF for: {pdf_name}")
+                    success = create_simple_pdf(pdf_path, student_data, self._log)
+                    if success:
+                        self._log(f"✅ Simple PDF created: {pdf_name}")
 
-                tpl.render(context)
+                # If all PDF methods fail
+                if not success:
+                    self._fail(f"❌ PDF conversion failed for: {pdf_name}")
+                    continue
 
-                safe_name = sanitize_filename(s["name"])
-                filename = f"{s['student_number']}_{safe_name}.docx"
-                out_docx = os.path.join(DOCX_OUT, filename)
-                os.makedirs(os.path.dirname(out_docx), exist_ok=True)
-                tpl.save(out_docx)
-                docx_files.append(out_docx)
+                processed_files += 1
+                self._advance(f"🔄 Converting ({processed_files}/{total_files})...")
+                if out_q is not None:
+                    out_q.put(item)
+        except Exception as e:
+            self._fail(f"❌ PDF conversion error: {str(e)[:150]}")
+            for _ in iter(in_q.get, None):
+                pass
+        finally:
+            session.close()
+            if session.restarts:
+                kill_word()  # cleanup after a crashed Word instance
+            if out_q is not None:
+                out_q.put(None)
+
+    def _simple_pdf_stage(self, in_q, merged_pdf_path):
+        """PDF stage without a converter: draws each student's simple PDF as
+        soon as the student is rendered, since it does not need the DOCX file.
+        When merging, the merged PDF is drawn as one multi-page batch instead
+        of being merged from the per-student files."""
+        drained = False
+        processed_files = 0
+        total_files = self.total if self.total is not None else "?"
+
+        def students():
+            nonlocal drained, processed_files
+            pending, next_index = {}, 0
+            for index, rec in iter(in_q.get, None):
+                if self._stop.is_set():
+                    continue  # keep draining so the renderer never blocks
+                pending[index] = rec
+                while next_index in pending:
+                    rec = pending.pop(next_index)
+                    next_index += 1
+                    processed_files += 1
+                    if rec["pdf_fresh"]:
+                        rec["entry"]["pdf"] = rec["pdf_hash"]
+                        self._advance(
+                            f"⏭️ PDF up to date ({processed_files}/{total_files})"
+                        )
+                    elif create_simple_pdf(rec["pdf"], rec["student"], self._log):
+                        rec["entry"]["pdf"] = rec["pdf_hash"]
+                        self._advance(
+                            f"🔄 Creating simple PDFs ({processed_files}/{total_files})..."
+                        )
+                    else:
+                        self._fail("❌ Simple PDF generation failed")
+                        continue
+                    if self.merge_pdf:
+                        yield rec["student"]
+            drained = True
 
-                current_step += 1
-                self.ui_callback(
-                    progress=current_step / total_steps,
-                    message=f"✅ Generated DOCX: {filename}",
-                )
+        pages = students()
+        try:
+            if self.merge_pdf:
+                first = next(pages, None)
+                if first is not None and not create_simple_pdf_batch(
+                    merged_pdf_path, itertools.chain([first], pages), self._log
+                ):
+                    self._fail("❌ Simple PDF generation failed")
+            else:
+                for _ in pages:
+                    pass
+        finally:
+            if not drained:
+                for _ in iter(in_q.get, None):
+                    pass
+        if self.merge_pdf and self._stop.is_set() and os.path.exists(merged_pdf_path):
+            os.remove(merged_pdf_path)
+
+    def _prune_outputs(self, previous, outputs):
+        """Remove the files of students that were in the last run's manifest
+        but are no longer in the roster"""
+        removed = 0
+        for name in previous.keys() - outputs.keys():
+            stem = os.path.splitext(os.path.basename(name))[0]
+            for path in (
+                os.path.join(DOCX_OUT, os.path.basename(name)),
+                os.path.join(PDF_OUT, stem + ".pdf"),
+            ):
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+        if removed:
+            self._log(
+                f"🗑️ Removed {removed} file(s) of students no longer in the roster"
+            )
 
-            except Exception as e:
-                self.ui_callback(
-                    progress=current_step / total_steps,
-                    message=f"❌ Error for {s['name']}: {str(e)[:150]}",
-                    error=True,
-                )
-                return  # Stop immediately
+    def _merge_pdf_stage(self, in_q, merged_pdf_path):
+        """PDF merge stage: appends each PDF as soon as it and every PDF before
+        it in roster order are ready"""
+        merger = None
+        pending, next_index = {}, 0
+        try:
+            merger = StreamingPdfMerger(merged_pdf_path)
+            for index, rec in iter(in_q.get, None):
+                if self._stop.is_set():
+                    continue
+                pending[index] = rec["pdf"]
+                while next_index in pending:
+                    f = pending.pop(next_index)
+                    next_index += 1
+                    try:
+                        merger.append(f)
+                    except ValueError as e:
+                        self._log(f"⚠️ Skipping invalid PDF {os.path.basename(f)}: {e}")
+            if self._stop.is_set():
+                merger.abort()
+            elif not merger.kids:
+                merger.abort()
+                self._fail("⚠️ No valid PDFs to merge.")
+            else:
+                merger.close()
+        except Exception as e:
+            if merger:
+                merger.abort()  # also removes the half-written file
+            elif os.path.exists(merged_pdf_path):
+                os.remove(merged_pdf_path)
+            self._fail(f"❌ Error merging PDFs: {str(e)[:150]}")
+            for _ in iter(in_q.get, None):
+                pass
 
-            except Exception as e:
-                self.ui_callback(
-                    progress=current_step / total_steps,
-                    message=f"❌ Error for {s['name']}: {str(e)[:150]}",
-                    error=True,
-                )
-                return  # Stop immediately
+    def run(self):
+        if self.sounds:
+            play_wav("assets/sounds/Generating.wav")
 
-        # ---------------- Generate PDF files ----------------
-        if self.gen_pdf:
+        # ---------------- Preflight: check template once ----------------
+        if self.merge_pdf and not self.gen_pdf:
             self.ui_callback(
-                progress=current_step / total_steps,
-                message="🔄 Starting PDF conversion...",
+                message="⚠️ Cannot merge PDFs without generating PDFs.", error=True
             )
-            os.makedirs(PDF_OUT, exist_ok=True)
+            return
+        try:
+            tpl, missing_required = preflight_template(self.template_path)
+        except Exception as e:
+            self.ui_callback(
+                progress=0.0,
+                message=f"❌ Failed to load template: {str(e)[:150]}",
+                error=True,
+            )
+            return
+        if missing_required:
+            self.ui_callback(
+                progress=0.0,
+                message=f"❌ Template missing required placeholder(s): {', '.join(missing_required)}",
+                error=True,
+            )
+            return
 
-            total_files = len(docx_files)
-            processed_files = 0
-
-            for f in docx_files:
-                pdf_name = os.path.splitext(os.path.basename(f))[0] + ".pdf"
-                pdf_path = os.path.join(PDF_OUT, pdf_name)
-                success = False
-
-                # Find student data for this file
-                student_data = None
-                for s in self.students:
-                    safe_name = sanitize_filename(s["name"])
-                    if f"{s['student_number']}_{safe_name}.docx" in f:
-                        student_data = {
-                            "name": s["name"],
-                            "student_number": s["student_number"],
-                        }
-                        break
-
-                # Method 1: Microsoft Word (Windows only)
-                if sys.platform.startswith("win"):
-                    self.ui_callback(message=f"🔄 Trying Microsoft Word: {pdf_name}")
-                    success = convert_with_word(
-                        f, pdf_path, lambda msg: self.ui_callback(message=msg)
-                    )
-                    if success and is_valid_pdf(pdf_path):
-                        pdf_files.append(pdf_path)
-                        self.ui_callback(
-                            message=f"✅ PDF created (Microsoft Word): {pdf_name}"
+        # Progress units: one per rendered student, one per PDF, one per merge
+        n = self.total
+        self._total = None
+        if n is not None:
+            self._total = n + (n if self.gen_pdf else 0)
+            self._total += int(self.merge_docx) + int(self.merge_pdf)
+        self._done = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        # Individual files are only needed for "Generate Docx" and as PDF input;
+        # a merged-only run renders straight into MERGED_ALL.docx
+        write_docx = self.gen_docx or self.gen_pdf or not self.merge_docx
+        if write_docx:
+            os.makedirs(DOCX_OUT, exist_ok=True)
+
+        # Records are built lazily as jobs are handed out and dropped once the
+        # student has been processed, so a streamed roster stays bounded
+        students = iter(self.students)
+        try:
+            first = next(students, None)
+        except Exception as e:
+            self._fail(f"❌ Failed to read file: {str(e)[:150]}")
+            return
+        if first is not None:
+            students = itertools.chain([first], students)
+        inflight = {}
+
+        # The manifest tracks the individual files, so merged-only runs (which
+        # have none) neither use nor update it
+        tracked = write_docx
+        previous = load_manifest() if tracked else {}
+        outputs = {}  # manifest entries for this run
+        ready = collections.deque()  # up-to-date students, in job order
+        # A PDF's hash also names what drew it, so placeholder PDFs are rebuilt
+        # once a converter is available
+        pdf_source = "converter" if self.converter else "simple"
+
+        def jobs():
+            for i, student in enumerate(students):
+                rec = inflight[i] = student_record(student)
+                last = previous.get(os.path.basename(rec["docx"]), {})
+                rec["hash"] = output_hash(tpl.file_hash, rec["student"])
+                rec["pdf_hash"] = output_hash(tpl.file_hash, rec["student"], pdf_source)
+                rec["fresh"] = (
+                    self.incremental
+                    and last.get("docx") == rec["hash"]
+                    and os.path.exists(rec["docx"])
+                )
+                rec["pdf_fresh"] = (
+                    self.incremental
+                    and self.gen_pdf
+                    and last.get("pdf") == rec["pdf_hash"]
+                    and os.path.exists(rec["pdf"])
+                )
+                # The PDF stages record the PDF hash once it is current; a run
+                # without PDFs keeps the last one, which still names its inputs
+                rec["entry"] = {"docx": rec["hash"]}
+                if not self.gen_pdf and "pdf" in last:
+                    rec["entry"]["pdf"] = last["pdf"]
+                if rec["fresh"]:
+                    ready.append(i)
+                else:
+                    yield i, rec["student"], rec["docx"] if write_docx else None
+
+        def results():
+            """Rendered students, with up-to-date ones read back from disk"""
+
+            def up_to_date():
+                while ready:
+                    i = ready.popleft()
+                    document = None
+                    if self.merge_docx:
+                        with zipfile.ZipFile(inflight[i]["docx"]) as z:
+                            document = {
+                                name: z.read(name) for name in tpl.merge_part_names
+                            }
+                    yield i, inflight[i]["docx"], None, document
+
+            for result in self.render_docx(tpl, jobs(), n):
+                yield from up_to_date()
+                yield result
+            yield from up_to_date()
+
+        # ---------------- Pipeline: DOCX → PDF → merges ----------------
+        # Stages run concurrently and hand records over through bounded
+        # queues, so a student's PDF converts while the next one renders.
+        merged_pdf_path = os.path.join(MERGED_PDF_OUT, "MERGED_ALL.pdf")
+        pdf_q = merge_q = None
+        threads = []
+        if self.gen_pdf:
+            os.makedirs(PDF_OUT, exist_ok=True)
+            if self.merge_pdf:
+                os.makedirs(MERGED_PDF_OUT, exist_ok=True)
+            self._log("🔄 Starting PDF conversion...")
+            if self.converter:
+                pdf_q = queue.Queue(maxsize=PIPELINE_DEPTH)
+                if self.merge_pdf:
+                    merge_q = queue.Queue(maxsize=PIPELINE_DEPTH)
+                    threads.append(
+                        threading.Thread(
+                            target=self._merge_pdf_stage,
+                            args=(merge_q, merged_pdf_path),
+                            daemon=True,
                         )
-                    else:
-                        success = False
-
-                # Method 2: Simple PDF fallback
-                if not success and student_data:
-                    self.ui_callback(message=f"🔄 Creating simple PDF for: {pdf_name}")
-                    success = create_simple_pdf(
-                        pdf_path,
-                        student_data,
-                        lambda msg: self.ui_callback(message=msg),
                     )
-                    if success and os.path.exists(pdf_path):
-                        pdf_files.append(pdf_path)
-                        self.ui_callback(message=f"✅ Simple PDF created: {pdf_name}")
-                    else:
-                        success = False
-
-                # If all PDF methods fail
-                if not success:
-                    self.ui_callback(
-                        message=f"❌ PDF conversion failed for: {pdf_name}", error=True
+                threads.append(
+                    threading.Thread(
+                        target=self._convert_stage, args=(pdf_q, merge_q), daemon=True
                     )
-                    return  # Stop immediately
-
-                processed_files += 1
-                progress_increment = 1 / total_files / total_steps
-                current_progress = current_step / total_steps + (
-                    processed_files * progress_increment
                 )
-                self.ui_callback(
-                    progress=current_progress,
-                    message=f"🔄 Converting ({processed_files}/{total_files})...",
+            else:
+                pdf_q = queue.Queue(maxsize=PIPELINE_DEPTH)
+                threads.append(
+                    threading.Thread(
+                        target=self._simple_pdf_stage,
+                        args=(pdf_q, merged_pdf_path),
+                        daemon=True,
+                    )
                 )
-                time.sleep(0.3)  # small delay
+        for t in threads:
+            t.start()
 
-            current_step += 1
-            self.ui_callback(
-                progress=current_step / total_steps,
-                message="✅ PDF conversion completed",
-            )
-            kill_word()  # cleanup
+        # ---------------- Generate DOCX files ----------------
+        if self.workers > 1 and (n is None or n >= POOL_MIN_STUDENTS):
+            self._log(f"🔄 Rendering with {self.workers} worker processes...")
 
-        # ---------------- Merge DOCX files ----------------
-        if self.merge_docx and docx_files:
-            try:
-                master = Document(docx_files[0])
-                composer = Composer(master)
-                for f in docx_files[1:]:
-                    composer.append(Document(f))
+        # Merged DOCX is streamed from the rendered bodies, in roster order
+        merger = None
+        merged_path = os.path.join(MERGED_DOCX_OUT, "MERGED_ALL.docx")
+        pending, next_index = {}, 0
 
-                merged_path = os.path.join(MERGED_DOCX_OUT, "MERGED_ALL.docx")
+        try:
+            if self.merge_docx and first is not None:
                 os.makedirs(MERGED_DOCX_OUT, exist_ok=True)
-                composer.save(merged_path)
+                merger = StreamingDocxMerger(tpl, merged_path, first)
+
+            for index, out_docx, error, document in results():
+                if self._stop.is_set():
+                    break
+                rec = inflight.pop(index)
+                if error:
+                    self._fail(f"❌ Error for {rec['student']['name']}: {error}")
+                    break  # Stop immediately
+                self.processed += 1
+                if tracked:
+                    outputs[os.path.basename(out_docx)] = rec["entry"]
+
+                if merger:
+                    pending[index] = document
+                    while next_index in pending:
+                        merger.add(pending.pop(next_index))
+                        next_index += 1
+                if pdf_q is not None:
+                    pdf_q.put((index, rec))
+
+                if rec["fresh"]:
+                    message = f"⏭️ Up to date: {os.path.basename(out_docx)}"
+                elif out_docx:
+                    message = f"✅ Generated DOCX: {os.path.basename(out_docx)}"
+                else:
+                    message = f"✅ Rendered: {rec['student']['name']}"
+                self._advance(message)
+        except Exception as e:
+            self._fail(f"❌ Error generating DOCX: {str(e)[:150]}")
 
-                current_step += 1
-                self.ui_callback(
-                    progress=current_step / total_steps,
-                    message=f"✅ Merged DOCX saved: {merged_path}",
-                )
-            except Exception as e:
-                self.ui_callback(
-                    progress=current_step / total_steps,
-                    message=f"❌ Error merging DOCX: {str(e)[:150]}",
-                    error=True,
-                )
-                return
+        # ---------------- Merge DOCX files ----------------
+        if merger:
+            if self._stop.is_set():
+                merger.abort()
+            else:
+                try:
+                    merger.close()
+                    self._advance(f"✅ Merged DOCX saved: {merged_path}")
+                except Exception as e:
+                    merger.abort()
+                    self._fail(f"❌ Error merging DOCX: {str(e)[:150]}")
+
+        # ---------------- Finish PDF files and merge ----------------
+        if pdf_q is not None:
+            pdf_q.put(None)
+        for t in threads:
+            t.join()
+        if self._stop.is_set():
+            return  # error already reported
 
-        # ---------------- Merge PDF files ----------------
+        if self.gen_pdf:
+            self._log("✅ PDF conversion completed")
         if self.merge_pdf:
-            if not self.gen_pdf:
-                self.ui_callback(
-                    message="⚠️ Cannot merge PDFs without generating PDFs.", error=True
-                )
-                return
+            self._advance(f"✅ Merged PDF saved: {merged_pdf_path}")
+
+        # ---------------- Update build manifest ----------------
+        if tracked:
+            self._prune_outputs(previous, outputs)
             try:
-                valid_pdfs = [f for f in pdf_files if is_valid_pdf(f)]
-                if not valid_pdfs:
-                    self.ui_callback(message="⚠️ No valid PDFs to merge.", error=True)
-                    return
+                save_manifest(outputs)
+            except OSError as e:
+                self._log(f"⚠️ Could not save build manifest: {e}")
 
-                merger = PdfMerger(strict=False)
-                for f in valid_pdfs:
-                    merger.append(f)
-                merged_pdf_path = os.path.join(MERGED_PDF_OUT, "MERGED_ALL.pdf")
-                os.makedirs(MERGED_PDF_OUT, exist_ok=True)
-                merger.write(merged_pdf_path)
-                merger.close()
-                current_step += 1
-                self.ui_callback(
-                    progress=current_step / total_steps,
-                    message=f"✅ Merged PDF saved: {merged_pdf_path}",
-                )
+        self.ui_callback(progress=1.0, message="✅ All tasks completed.", done=True)
+        if self.sounds:
+            play_wav("assets/sounds/completed.wav")
+
+
+# ---------------- Activity Log ----------------
+class LogSink(threading.Thread):
+    """Background writer for the activity log. Any thread queues records;
+    they are written in batches, and the file is rotated by size into
+    fams_log.1.txt ... fams_log.N.txt."""
+
+    def __init__(self, path, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS):
+        super().__init__(daemon=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._q = queue.SimpleQueue()
+        self._stream = None
+        self._size = 0
+
+    def log(self, text, level="INFO", source="app"):
+        """Queue one record: timestamp, level, source and message, tab
+        separated on a single line"""
+        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        text = str(text).replace("\r", "").replace("\n", "\\n")
+        self._q.put(f"{ts}\t{level}\t{source}\t{text}\n")
+
+    def flush(self, timeout=5.0):
+        """Block until every record queued so far is on disk"""
+        written = threading.Event()
+        self._q.put(written)
+        written.wait(timeout)
+
+    def close(self, timeout=5.0):
+        self._q.put(None)
+        self.join(timeout)
+
+    def backup_path(self, n):
+        root, ext = os.path.splitext(self.path)
+        return f"{root}.{n}{ext}"
 
-            except Exception as e:
-                self.ui_callback(
-                    progress=current_step / total_steps,
-                    message=f"❌ Error merging PDFs: {str(e)[:150]}",
-                    error=True,
-                )
+    def run(self):
+        buffer, deadline = [], None
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                item = self._q.get(timeout=timeout)
+            except queue.Empty:
+                item = ""  # the oldest buffered record is due
+            if isinstance(item, str) and item:
+                buffer.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + LOG_FLUSH_SECONDS
+                if len(buffer) < LOG_BATCH_RECORDS and time.monotonic() < deadline:
+                    continue
+            if buffer:
+                self._write("".join(buffer))
+                buffer = []
+            deadline = None
+            if isinstance(item, threading.Event):
+                item.set()  # flush request
+            elif item is None:
+                if self._stream:
+                    self._stream.close()
                 return
 
-        self.ui_callback(progress=1.0, message="✅ All tasks completed.", done=True)
-        play_wav("assets/sounds/completed.wav")
+    def _write(self, data):
+        try:
+            if self._stream is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._stream = open(self.path, "a", encoding="utf-8")
+                self._size = os.path.getsize(self.path)
+            size = len(data.encode("utf-8"))
+            if self._size and self._size + size > self.max_bytes:
+                self._rotate()
+            self._stream.write(data)
+            self._stream.flush()
+            self._size += size
+        except OSError as e:
+            print(f"Failed to write log file: {e}")
+
+    def _rotate(self):
+        self._stream.close()
+        for n in range(self.backups - 1, 0, -1):
+            if os.path.exists(self.backup_path(n)):
+                os.replace(self.backup_path(n), self.backup_path(n + 1))
+        if self.backups:
+            os.replace(self.path, self.backup_path(1))
+        else:
+            os.remove(self.path)
+        self._stream = open(self.path, "a", encoding="utf-8")
+        self._size = 0
+
+
+# ---------------- Icons ----------------
+_icons = {}
+
+
+def icon(path, size, resample=None):
+    """PhotoImage of path resized to size. Each (path, size) is decoded once,
+    when first shown, and reused afterwards."""
+    key = (path, size, resample)
+    if key not in _icons:
+        image = Image.open(path)
+        if resample is None:
+            image = image.resize(size)
+        else:
+            image = image.resize(size, resample)
+        _icons[key] = ImageTk.PhotoImage(image)
+    return _icons[key]
+
+
+# ---------------- Student Table ----------------
+class VirtualTable:
+    """Drives a Treeview that only holds the rows currently on screen. The
+    roster stays in its columnar arrays; scrolling rewrites the visible
+    items and search narrows an index array over the full list."""
+
+    def __init__(self, tree, scrollbar):
+        self.tree, self.scrollbar = tree, scrollbar
+        self.names = self.numbers = np.array([], dtype=object)
+        self.view = np.arange(0)  # roster rows matching the search, in order
+        self.top = 0
+        self.query = ""
+        self._haystack = None  # lower-cased columns, built on first search
+        scrollbar.config(command=self.yview)
+        tree.configure(yscrollcommand="")
+        tree.bind("<Configure>", lambda e: self.render())
+        tree.bind("<MouseWheel>", lambda e: self.scroll(-3 * (e.delta // 120)))
+        tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        tree.bind("<Button-5>", lambda e: self.scroll(3))
+        tree.bind("<Prior>", lambda e: self.scroll(-self.page_rows()))
+        tree.bind("<Next>", lambda e: self.scroll(self.page_rows()))
+
+    def set_roster(self, students):
+        if hasattr(students, "names"):
+            self.names, self.numbers = students.names, students.numbers
+        else:
+            self.names = np.array([s["name"] for s in students], dtype=object)
+            self.numbers = np.array(
+                [s["student_number"] for s in students], dtype=object
+            )
+        self._haystack = None
+        self.search(self.query)
+
+    def search(self, query):
+        """Show the rows whose name or student number contains query"""
+        self.query = query.strip().lower()
+        if not self.query:
+            self.view = np.arange(len(self.names))
+        else:
+            if self._haystack is None:
+                self._haystack = (
+                    pd.Series(self.names, dtype=object).str.lower(),
+                    pd.Series(self.numbers, dtype=object).str.lower(),
+                )
+            names, numbers = self._haystack
+            mask = names.str.contains(self.query, regex=False) | numbers.str.contains(
+                self.query, regex=False
+            )
+            self.view = np.flatnonzero(mask.to_numpy())
+        self.top = 0
+        self.render()
+
+    def page_rows(self):
+        """Rows that fit in the Treeview's current height"""
+        rowheight = int(ttk.Style().lookup(self.tree["style"], "rowheight") or 20)
+        height = self.tree.winfo_height()
+        if height <= 1:  # not mapped yet
+            return int(self.tree["height"])
+        return max(1, height // rowheight - 1)  # less the heading
+
+    def scroll(self, rows):
+        self.top += rows
+        self.render()
+        return "break"
+
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.view))
+        elif args[0] == "scroll":
+            step = self.page_rows() if args[2] == "pages" else 1
+            self.top += int(args[1]) * step
+        self.render()
+
+    def render(self):
+        rows = self.page_rows()
+        total = len(self.view)
+        self.top = max(0, min(self.top, total - rows))
+        shown = min(rows, total - self.top)
+
+        items = self.tree.get_children()
+        if len(items) > shown:
+            self.tree.delete(*items[shown:])
+        for slot in range(len(items), shown):
+            self.tree.insert("", "end")
+        for slot, iid in enumerate(self.tree.get_children()):
+            i = self.top + slot
+            row = self.view[i]
+            self.tree.item(
+                iid,
+                values=(self.numbers[row], self.names[row]),
+                tags=("evenrow" if i % 2 == 0 else "oddrow",),
+            )
+        if total:
+            self.scrollbar.set(self.top / total, (self.top + shown) / total)
+        else:
+            self.scrollbar.set(0, 1)
 
 
 class FAMSApp:
     def __init__(self, root):
         global topf
         self.root, self.students, self.template_path = root, [], None
+        self.roster_loader = None
+        self.events = queue.SimpleQueue()  # worker/log/roster events for pump_events
+        self.speaker = Speaker(enabled=SPEECH_ENABLED)
+        self.log_sink = LogSink(LOG_FILE)
+        self.log_sink.start()
+        self.log_sink.log("FAMS session started")
         self.all_buttons = []
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         root.title("FAMS - Form Automation Management System")
@@ -598,8 +2608,7 @@ class FAMSApp:
             fg="white",
         ).place(x=20, y=60)
         try:
-            img = Image.open("assets/mbc.png").resize((90, 90))
-            self.logo_img = ImageTk.PhotoImage(img)
+            self.logo_img = icon("assets/mbc.png", (90, 90))
             tk.Label(header_frame, image=self.logo_img, bg="#2e4a9d").pack(
                 side="right", padx=15
             )
@@ -625,8 +2634,7 @@ class FAMSApp:
             topf, text="No file selected", fg="red", bg="#f0f4ff", font=("Segoe UI", 10)
         )
         self.lbl_file.grid(row=0, column=1, sticky="w", padx=8)
-        browse_img = Image.open("assets/browse.png").resize((20, 20))
-        self.browse_imgtk = ImageTk.PhotoImage(browse_img)
+        self.browse_imgtk = icon("assets/browse.png", (20, 20))
         self.btn_file = ctk.CTkButton(
             topf,
             text="Browse",
@@ -674,8 +2682,7 @@ class FAMSApp:
         self.btn_template.grid(row=1, column=2, padx=6)
         self.all_buttons.append(self.btn_template)
 
-        help_img = Image.open("assets/help.png").resize((20, 20))
-        help_imgtk = ImageTk.PhotoImage(help_img)
+        help_imgtk = icon("assets/help.png", (20, 20))
         ctk.CTkButton(
             topf,
             text="Help",
@@ -697,6 +2704,17 @@ class FAMSApp:
             font=("Segoe UI", 11, "bold"),
         )
         left.pack(side="left", fill="both", expand=True, padx=(0, 6))
+        searchf = tk.Frame(left, bg="#f0f4ff")
+        searchf.pack(fill="x", padx=6, pady=(4, 0))
+        tk.Label(searchf, text="🔍", bg="#f0f4ff", font=("Segoe UI Emoji", 10)).pack(
+            side="left"
+        )
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *a: self.schedule_search())
+        self._search_job = None
+        tk.Entry(searchf, textvariable=self.search_var, font=("Segoe UI", 10)).pack(
+            side="left", fill="x", expand=True, padx=4
+        )
         scrollbar = ttk.Scrollbar(left, orient="vertical")
         scrollbar.pack(side="right", fill="y")
         self.tree = ttk.Treeview(
@@ -714,8 +2732,8 @@ class FAMSApp:
         self.tree.column("sid", width=160, anchor="center")
         self.tree.column("name", width=360, anchor="w")
         self.tree.pack(fill="both", expand=True, padx=6, pady=4)
+        self.table = VirtualTable(self.tree, scrollbar)
 
-        scrollbar.config(command=self.tree.yview)
         self.lbl_count = tk.Label(
             left,
             text="0 students loaded",
@@ -733,8 +2751,7 @@ class FAMSApp:
         )
         right.pack(side="right", fill="y")
 
-        gen_img = Image.open("assets/genrate.png").resize((30, 30))
-        gen_imgtk = ImageTk.PhotoImage(gen_img)
+        gen_imgtk = icon("assets/genrate.png", (30, 30))
         self.generate_btn = ctk.CTkButton(
             right,
             text="Generate Documents",
@@ -784,8 +2801,7 @@ class FAMSApp:
             font=("Segoe UI", 14, "bold"),
         ).pack(pady=2, padx=50, anchor="w")
 
-        openfolder_img = Image.open("assets/openfolder.png").resize((30, 30))
-        openfoldertk = ImageTk.PhotoImage(openfolder_img)
+        openfoldertk = icon("assets/openfolder.png", (30, 30))
 
         self.btn_open_output = ctk.CTkButton(
             right,
@@ -802,8 +2818,7 @@ class FAMSApp:
         btn_frame = tk.Frame(right, bg="#f0f4ff")
         btn_frame.pack(pady=6, fill="x")
 
-        img_log = Image.open("assets/log.png").resize((20, 20))
-        img_logtk = ImageTk.PhotoImage(img_log)
+        img_logtk = icon("assets/log.png", (20, 20))
         self.btn_logs = ctk.CTkButton(
             btn_frame,
             text="Download Logs",
@@ -816,8 +2831,7 @@ class FAMSApp:
         self.btn_logs.pack(side="left", expand=True, fill="x", padx=(3, 3))
         self.all_buttons.append(self.btn_logs)
 
-        clear_img = Image.open("assets/clear.png").resize((20, 20))
-        clear_imgtk = ImageTk.PhotoImage(clear_img)
+        clear_imgtk = icon("assets/clear.png", (20, 20))
         self.btn_clear = ctk.CTkButton(
             btn_frame,
             text="Clear Fields",
@@ -854,49 +2868,87 @@ class FAMSApp:
             right, width=36, height=12, state="disabled", font=("Consolas", 9)
         )
         self.log.pack(padx=6, pady=(0, 6))
+        self.root.after(UI_FRAME_MS, self.pump_events)
 
     def on_close(self):
         if messagebox.askokcancel("Exit", "Are you sure to exit FAMS?"):
+            self.log_sink.close()
             try:
                 os._exit(0)  # HARD EXIT – guaranteed
             except:
                 self.root.destroy()
 
     def browse_file(self):
+        # While a roster is loading the button cancels it
+        if self.roster_loader is not None:
+            self.roster_loader.cancel()
+            return
         path = filedialog.askopenfilename(
             filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xls;*.xlsx")]
         )
         if not path:
             return
-        try:
-            students = read_students(path)
-            self.students = students
-            self.lbl_file.configure(text=os.path.basename(path), fg="green")
-            self.btn_file.configure(
-                text="Browse",
-            )
+        self.roster_loader = RosterLoader(path, self.roster_callback)
+        self.lbl_file_before = (self.lbl_file.cget("text"), self.lbl_file.cget("fg"))
+        self.lbl_file.configure(
+            text=f"Loading {os.path.basename(path)}...", fg="#2e4a9d"
+        )
+        self.btn_file.configure(text="Cancel")
+        self.roster_loader.start()
 
-            self.check_browse = Image.open("assets/check.png").resize((30, 30))
-            self.check_browse_tk = ImageTk.PhotoImage(self.check_browse)
-            self.check_lbl_browse = tk.Label(
-                topf, image=self.check_browse_tk, bg="#f0f4ff"
-            )
-            self.check_lbl_browse.grid(row=0, column=3, sticky="w")
-            self.refresh_table()
-            self.log_message(f"✅ Loaded {len(students)} students")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to read file: {e}")
-            print(f"Failed to read file: {e}")
+    def roster_callback(self, loader, **event):
+        """Callback from the RosterLoader thread, queued for pump_events"""
+        self.events.put(("roster", loader, event))
+
+    def roster_event(
+        self,
+        loader,
+        message="",
+        rows=None,
+        total=None,
+        students=None,
+        error=None,
+        cancelled=False,
+    ):
+        if loader is not self.roster_loader:
+            return  # a cancelled or superseded load
+        if message:
+            self.log_message(message)
+        if rows is not None:
+            of = f" of {total:,}" if total else ""
+            self.lbl_count.config(text=f"Loading... {rows:,}{of} rows")
+        if students is None and error is None and not cancelled:
+            return
+
+        self.roster_loader = None
+        self.btn_file.configure(text="Browse")
+        if students is None:
+            text, fg = self.lbl_file_before
+            self.lbl_file.configure(text=text, fg=fg)
+            self.update_count()
+            if cancelled:
+                self.log_message("🛑 Loading student file cancelled.")
+            else:
+                messagebox.showerror("Error", f"Failed to read file: {error}")
+                print(f"Failed to read file: {error}")
+            return
+
+        self.students = students
+        self.lbl_file.configure(text=os.path.basename(loader.path), fg="green")
+        self.check_browse_tk = icon("assets/check.png", (30, 30))
+        self.check_lbl_browse = tk.Label(topf, image=self.check_browse_tk, bg="#f0f4ff")
+        self.check_lbl_browse.grid(row=0, column=3, sticky="w")
+        self.refresh_table()
+        self.log_message(f"✅ Loaded {len(students)} students")
 
     def browse_template(self):
         path = filedialog.askopenfilename(filetypes=[("Word Document", "*.docx")])
         if path and path.lower().endswith(".docx"):
             # Load template
             try:
-                tpl = DocxTemplate(path)
-                required_placeholders = {"name", "student_number"}
-                template_placeholders = tpl.get_undeclared_template_variables()
-                missing = required_placeholders - template_placeholders
+                with open(path, "rb") as f:
+                    placeholders = template_placeholders(f.read())
+                missing = REQUIRED_PLACEHOLDERS - placeholders
                 if missing:
                     messagebox.showerror(
                         "Template Error",
@@ -910,8 +2962,7 @@ class FAMSApp:
             self.template_path = path
             self.lbl_template.configure(text=os.path.basename(path), fg="green")
             self.btn_template.configure(text="Browse")
-            self.check_temp = Image.open("assets/check.png").resize((30, 30))
-            self.check_temp_tk = ImageTk.PhotoImage(self.check_temp)
+            self.check_temp_tk = icon("assets/check.png", (30, 30))
             self.check_lbl_temp = tk.Label(topf, image=self.check_temp_tk, bg="#f0f4ff")
             self.check_lbl_temp.grid(row=1, column=3, sticky="w")
             self.log_message(f"✅ Template selected: {os.path.basename(path)}")
@@ -919,46 +2970,41 @@ class FAMSApp:
             messagebox.showerror("Invalid", "Please select a DOCX template.")
 
     def speak(self, text):
-        engine = pyttsx3.init()
-        voices = engine.getProperty("voices")
-
-        for voice in voices:
-            if "female" in voice.name.lower() or "zira" in voice.name.lower():
-                engine.setProperty("voice", voice.id)
-                break
-
-        engine.say(text)
-        engine.runAndWait()
+        self.speaker.say(text)
 
     def refresh_table(self):
-        for r in self.tree.get_children():
-            self.tree.delete(r)
-
-        for i, s in enumerate(self.students[:2000]):
-            tag = "evenrow" if i % 2 == 0 else "oddrow"
-            self.tree.insert(
-                "", "end", values=(s["student_number"], s["name"]), tags=(tag,)
+        self.table.set_roster(self.students)
+        self.speak(f"{len(self.students)} students loaded")
+        self.update_count()
+
+    def update_count(self):
+        if self.table.query:
+            self.lbl_count.config(
+                text=f"{len(self.table.view):,} of {len(self.students):,} students match"
             )
-        threading.Thread(
-            target=lambda: self.speak(f"{len(self.students)} students loaded"),
-            daemon=True,
-        ).start()
-        self.lbl_count.config(text=f"{len(self.students)} students loaded")
+        else:
+            self.lbl_count.config(text=f"{len(self.students)} students loaded")
+
+    def schedule_search(self):
+        """Search once typing pauses rather than on every keystroke"""
+        if self._search_job is not None:
+            self.root.after_cancel(self._search_job)
+        self._search_job = self.root.after(150, self.run_search)
+
+    def run_search(self):
+        self._search_job = None
+        self.table.search(self.search_var.get())
+        if self.roster_loader is None:
+            self.update_count()
 
     def start_generate(self):
 
         if not self.students:
-            threading.Thread(
-                target=lambda: play_wav("assets/sounds/upload_data_first.wav"),
-                daemon=True,
-            ).start()
+            play_wav("assets/sounds/upload_data_first.wav")
             messagebox.showwarning("No data", "Upload student data first.")
             return
         if not self.template_path:
-            threading.Thread(
-                target=lambda: play_wav("assets/sounds/select_docx_temp.wav"),
-                daemon=True,
-            ).start()
+            play_wav("assets/sounds/select_docx_temp.wav")
             messagebox.showwarning("No template", "Select a DOCX template.")
             return
         if not (
@@ -991,6 +3037,7 @@ class FAMSApp:
             self.pdf_var.get(),
             self.merge_docx_var.get(),
             self.merge_pdf_var.get(),
+            workers=RENDER_WORKERS,
         ).start()
 
     def worker_callback(self, progress=0.0, message="", done=False, error=False):
@@ -1000,49 +3047,74 @@ class FAMSApp:
         - message: string log message
         - done: True if all tasks completed
         - error: True if an error occurred
+        Events are queued and applied by pump_events once per frame.
         """
+        if message:
+            self.log_sink.log(message, "ERROR" if error else "INFO", "worker")
+        self.events.put(("worker", datetime.now(), progress, message, done, error))
+
+    def log_message(self, text):
+        self.log_sink.log(text)
+        self.events.put(("log", datetime.now(), text))
+
+    def pump_events(self):
+        """Apply everything queued since the last frame: the latest progress
+        value, the newest log lines, roster loading events and any error/done
+        popups"""
+        self.root.after(UI_FRAME_MS, self.pump_events)
+        lines, progress, roster, popups = [], None, [], []
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "roster":
+                roster.append(event[1:])
+                continue
+            if event[0] == "log":
+                _, ts, text = event
+            else:
+                _, ts, progress, text, done, error = event
+                if error and text:
+                    popups.append(
+                        lambda m=text: messagebox.showerror(
+                            "Error Occurred", f"{m}\n\nSee Activity Log for details."
+                        )
+                    )
+                if done:
+                    popups.append(
+                        lambda: messagebox.showinfo(
+                            "Done", "All tasks completed successfully."
+                        )
+                    )
+            if text:
+                lines.append(f"[{ts.strftime('%H:%M:%S')}] {text}\n")
 
-        def update():
-            # Update progress bar
+        if progress is not None:
             self.progress["value"] = progress * 100
             self.progress_label.config(text=f"{int(progress*100)}%")
-
-            # Log message
-            if message:
-                self.log_message(message)
-
-            # Show error popup if error flag is set
-            if error and message:
-                messagebox.showerror(
-                    "Error Occurred", f"{message}\n\nSee Activity Log for details."
-                )
-
-            # Show completion info
-            if done:
-
-                messagebox.showinfo("Done", "All tasks completed successfully.")
-
-        self.root.after(0, update)
-
-    def log_message(self, text):
-        ts = datetime.now().strftime("%H:%M:%S")
-        msg = f"[{ts}] {text}\n"
-        self.log.config(state="normal")
-        self.log.insert("end", msg)
-        self.log.see("end")
-        self.log.config(state="disabled")
+        if lines:
+            self.log.config(state="normal")
+            self.log.insert("end", "".join(lines[-LOG_VISIBLE_LINES:]))
+            # The widget is a ring buffer of the newest lines
+            shown = int(self.log.index("end-1c").split(".")[0]) - 1
+            excess = shown - LOG_VISIBLE_LINES
+            if excess > 0:
+                self.log.delete("1.0", f"{excess + 1}.0")
+            self.log.see("end")
+            self.log.config(state="disabled")
+        for loader, event in roster:
+            self.roster_event(loader, **event)
+        for popup in popups:
+            popup()
 
     def save_logs(self):
-        os.makedirs(BASE_OUT, exist_ok=True)
-        logs = self.log.get("1.0", "end").strip()
-        if not logs:
+        # The log sink writes LOG_FILE as it goes; saving only flushes it
+        self.log_sink.flush()
+        if not os.path.exists(LOG_FILE) or not os.path.getsize(LOG_FILE):
             messagebox.showinfo("Logs", "No logs to save.")
             return
-        with open(LOG_FILE, "w", encoding="utf-8") as f:
-            f.write(logs)
-        threading.Thread(
-            target=lambda: play_wav("assets/sounds/download_log.wav"), daemon=True
-        ).start()
+        play_wav("assets/sounds/download_log.wav")
         messagebox.showinfo("Logs Saved", f"Logs saved to:\n{LOG_FILE}")
 
     def show_help(self):
@@ -1058,9 +3130,7 @@ class FAMSApp:
         frame = tk.Frame(help_win, padx=15, pady=15)
         frame.pack(fill="both", expand=True)
         try:
-            logo_img = Image.open(logo_path)
-            logo_img = logo_img.resize((100, 100), Image.LANCZOS)
-            self.help_logo = ImageTk.PhotoImage(logo_img)
+            self.help_logo = icon(logo_path, (100, 100), Image.LANCZOS)
 
             logo_label = tk.Label(help_win, image=self.help_logo, borderwidth=0)
             logo_label.place(relx=1, x=-30, y=30, anchor="ne")
@@ -1304,6 +3374,10 @@ class FAMSApp:
             subprocess.Popen(["xdg-open", path])
 
     def clear_fields(self):
+        if self.roster_loader is not None:
+            self.roster_loader.cancel()
+            self.roster_loader = None
+            self.btn_file.configure(text="Browse")
         self.students = []
         self.template_path = None
         self.lbl_file.config(text="No file selected", fg="red")
@@ -1317,35 +3391,34 @@ class FAMSApp:
 
         self.btn_template.configure(text="Browse")
 
-        for r in self.tree.get_children():
-            self.tree.delete(r)
+        self.search_var.set("")
+        self.table.set_roster(self.students)
         self.lbl_count.config(text="0 students loaded")
         self.log.config(state="normal")
         self.log.delete("1.0", "end")
         self.log.config(state="disabled")
         self.progress["value"] = 0
         self.progress_label.config(text="0%")
-        threading.Thread(
-            target=lambda: play_wav("assets/sounds/Cleared.wav"), daemon=True
-        ).start()
+        play_wav("assets/sounds/Cleared.wav")
         self.log_message("🧹 Cleared all fields.")
 
 
 if __name__ == "__main__":
-    splash = tk.Tk()
+    multiprocessing.freeze_support()
+    # The main window is built behind the splash, which closes once it is ready
+    root = tk.Tk()
+    root.withdraw()
+    splash = tk.Toplevel(root)
     splash.overrideredirect(True)
     splash.wm_attributes("-topmost", True)
-    threading.Thread(
-        target=lambda: play_wav("assets/sounds/fams.wav"), daemon=True
-    ).start()
+    play_wav("assets/sounds/fams.wav")
 
     if sys.platform.startswith("win"):
         splash.configure(bg="#FF66C4")
         splash.wm_attributes("-transparentcolor", "#FF66C4")
 
     try:
-        logo_img = Image.open("assets/splash.png").resize((600, 600))
-        splash.logo = ImageTk.PhotoImage(logo_img)
+        splash.logo = icon("assets/splash.png", (600, 600))
         width, height = splash.logo.width(), splash.logo.height()
     except:
         splash.logo = None
@@ -1363,9 +3436,9 @@ if __name__ == "__main__":
     label.pack()
 
     splash.update()
-    splash.after(3000, splash.destroy)
-    splash.mainloop()
 
-    root = tk.Tk()
     app = FAMSApp(root)
+    root.update_idletasks()
+    splash.destroy()
+    root.deiconify()
     root.mainloop()